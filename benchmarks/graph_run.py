@@ -0,0 +1,218 @@
+"""Measure research graph latency, throughput and memory with stub backends.
+
+Tavily and every agent's model are replaced by the deterministic stand-ins in
+`stubs.py`, so no network access or API keys are needed. Each run goes through
+the maximum number of reflection cycles, so every node is exercised.
+
+Usage:
+    uv run python benchmarks/graph_run.py [--runs N] [--people N]
+        [--concurrency N [N ...]] [--search-latency S] [--model-latency S]
+        [--results N] [--content-chars N] [--raw-content-chars N]
+        [--notes-chars N] [--telemetry-level {debug,info}]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import os
+import statistics
+import time
+import tracemalloc
+from collections import defaultdict
+from collections.abc import Generator
+
+# Keep telemetry quiet and local while benchmarking
+os.environ.setdefault("LOGFIRE_CONSOLE", "false")
+os.environ.setdefault("LOGFIRE_SEND_TO_LOGFIRE", "false")
+
+from pydantic_graph import NodeStep
+from stubs import StubSearchClient, filler_text, stub_model
+
+from people_researcher import nodes
+from people_researcher.deps import ResearchDeps
+from people_researcher.graph import research_graph
+from people_researcher.research import Researcher
+from people_researcher.state import Employment, PersonInfo, PersonState
+from people_researcher.telemetry import TelemetrySettings, configure_telemetry
+from people_researcher.tokens import (
+    CHARS_PER_TOKEN,
+    ENCODING_NAME,
+    get_encoding,
+    load_encoding,
+)
+
+
+@contextlib.contextmanager
+def stub_models(args: argparse.Namespace) -> Generator[None]:
+    """Override every research agent's model with a stub."""
+    info = PersonInfo(
+        years_experience=7,
+        current_company="ACME",
+        # Left unknown so the completeness check defers to the reflection agent
+        role="Unknown",
+        prior_companies=[
+            Employment(name="Initech", role="Engineer", year_started=2015)
+        ],
+        notes=filler_text("info", 200),
+    )
+    reflection = nodes.ReflectionOutput(
+        is_satisfactory=False,
+        missing_fields=["role"],
+        search_queries=["jane doe acme role", "jane doe linkedin"],
+        reasoning="Role is unknown.",
+    )
+    queries = nodes.Queries(queries=["jane doe acme", "jane doe engineer"])
+    notes = filler_text("notes", args.notes_chars)
+
+    latency = args.model_latency
+    with contextlib.ExitStack() as stack:
+        for agent, result in (
+            (nodes.query_agent, lambda: queries),
+            (nodes.research_notes_agent, lambda: notes),
+            (nodes.extraction_agent, lambda: info),
+            (nodes.incremental_extraction_agent, lambda: info),
+            (nodes.reflection_agent, lambda: reflection),
+        ):
+            stack.enter_context(agent.agent.override(model=stub_model(result, latency)))
+        yield
+
+
+def create_deps(args: argparse.Namespace) -> ResearchDeps:
+    """Create deps using a stub search client sized by the arguments."""
+    return ResearchDeps(
+        search_client=StubSearchClient(  # pyright: ignore[reportArgumentType]
+            latency=args.search_latency,
+            results=args.results,
+            content_chars=args.content_chars,
+            raw_content_chars=args.raw_content_chars,
+        )
+    )
+
+
+def person(i: int) -> PersonState:
+    """Create the initial state for the `i`th benchmark person."""
+    return PersonState(email=f"person{i}@acme.com", name=f"Person {i}", company="ACME")
+
+
+async def measure_latency(args: argparse.Namespace) -> None:
+    """Print end-to-end and per-node latency of sequential graph runs."""
+    deps = create_deps(args)
+    totals: list[float] = []
+    node_times: defaultdict[str, list[float]] = defaultdict(list)
+    for i in range(args.runs):
+        start = time.perf_counter()
+        _, history = await research_graph.run(
+            nodes.GenerateQueries(), state=person(i), deps=deps, infer_name=False
+        )
+        totals.append((time.perf_counter() - start) * 1000)
+        for step in history:
+            if isinstance(step, NodeStep) and step.duration is not None:
+                node_times[step.node.get_id()].append(step.duration * 1000)
+
+    totals.sort()
+    p95 = totals[min(len(totals) - 1, int(0.95 * len(totals)))]
+    print(f"end-to-end over {args.runs} runs")
+    print(f"{'':<16} {'min ms':>8} {'median ms':>10} {'p95 ms':>8}")
+    print(
+        f"{'graph run':<16} {totals[0]:>8.1f} "
+        f"{statistics.median(totals):>10.1f} {p95:>8.1f}"
+    )
+    print()
+    print("per node")
+    print(f"{'node':<16} {'calls/run':>9} {'median ms':>10} {'total ms/run':>13}")
+    for node_id, times in node_times.items():
+        print(
+            f"{node_id:<16} {len(times) / args.runs:>9.1f} "
+            f"{statistics.median(times):>10.1f} {sum(times) / args.runs:>13.1f}"
+        )
+
+
+async def research_all(args: argparse.Namespace, concurrency: int) -> float:
+    """Research `args.people` people and return the elapsed seconds."""
+    researcher = Researcher(create_deps(args))
+    people = (person(i) for i in range(args.people))
+    start = time.perf_counter()
+    async for _ in researcher.research_many(people, concurrency):
+        pass
+    return time.perf_counter() - start
+
+
+async def measure_throughput(args: argparse.Namespace) -> None:
+    """Print throughput and peak traced memory at each concurrency level."""
+    print(f"throughput over {args.people} people")
+    print(f"{'concurrency':<16} {'people/s':>8} {'seconds':>8} {'peak MiB':>9}")
+    for concurrency in args.concurrency:
+        elapsed = await research_all(args, concurrency)
+
+        # Trace memory in a separate pass so tracing doesn't skew the timing
+        tracemalloc.start()
+        await research_all(args, concurrency)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(
+            f"{concurrency:<16} {args.people / elapsed:>8.1f} "
+            f"{elapsed:>8.2f} {peak / 2**20:>9.1f}"
+        )
+
+
+async def run(args: argparse.Namespace) -> None:
+    """Run every benchmark with stubbed models."""
+    configure_telemetry(TelemetrySettings(level=args.telemetry_level))
+    # Token counting costs differ a lot between tiktoken and the fallback
+    await load_encoding()
+    if get_encoding() is None:
+        print(f"tokenizer: unavailable, estimating {CHARS_PER_TOKEN} chars/token")
+    else:
+        print(f"tokenizer: {ENCODING_NAME}")
+    print()
+    with stub_models(args):
+        await measure_latency(args)
+        print()
+        await measure_throughput(args)
+
+
+def main() -> None:
+    """Run the latency and throughput benchmarks."""
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--runs", type=int, default=20, help="Sequential runs")
+    parser.add_argument(
+        "--people", type=int, default=50, help="People per throughput level"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 10, 50],
+        help="Concurrency levels for the throughput benchmark",
+    )
+    parser.add_argument(
+        "--search-latency", type=float, default=0.02, help="Seconds per search"
+    )
+    parser.add_argument(
+        "--model-latency", type=float, default=0.02, help="Seconds per model call"
+    )
+    parser.add_argument("--results", type=int, default=5, help="Results per search")
+    parser.add_argument(
+        "--content-chars", type=int, default=500, help="Characters per result snippet"
+    )
+    parser.add_argument(
+        "--raw-content-chars",
+        type=int,
+        default=8_000,
+        help="Characters of raw content per result",
+    )
+    parser.add_argument(
+        "--notes-chars", type=int, default=2_000, help="Characters of research notes"
+    )
+    parser.add_argument(
+        "--telemetry-level",
+        choices=["debug", "info"],
+        default="debug",
+        help="Telemetry level to measure the instrumentation overhead at",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Measure process startup cost of the package and CLI.
+
+Each scenario runs in a fresh interpreter so nothing is cached between runs.
+
+Usage:
+    uv run python benchmarks/import_time.py [--runs N]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+SCENARIOS = {
+    "interpreter": "pass",
+    "import people_researcher": "import people_researcher",
+    "people-researcher --help": (
+        "import sys; sys.argv = ['people-researcher', '--help']\n"
+        "from people_researcher import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    ),
+    "import people_researcher.research": "import people_researcher.research",
+}
+
+
+def time_scenario(code: str, runs: int) -> list[float]:
+    """Run `code` in fresh interpreters and return wall times in milliseconds."""
+    timings: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", code], check=True, stdout=subprocess.DEVNULL
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def main() -> None:
+    """Print startup timings for each scenario."""
+    parser = argparse.ArgumentParser(description=(__doc__ or "").partition("\n")[0])
+    parser.add_argument("--runs", type=int, default=10, help="Runs per scenario")
+    args = parser.parse_args()
+
+    print(f"{'scenario':<36} {'min ms':>8} {'median ms':>10}")
+    for name, code in SCENARIOS.items():
+        timings = time_scenario(code, args.runs)
+        print(f"{name:<36} {min(timings):>8.1f} {statistics.median(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
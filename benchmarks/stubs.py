@@ -0,0 +1,92 @@
+"""Deterministic local stand-ins for Tavily and the research agents' models.
+
+Responses are generated from the request itself, so repeated runs do the same
+work, and each backend sleeps for a configurable latency to mimic the network.
+"""
+
+import asyncio
+import random
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+from pydantic import BaseModel
+
+from pydantic_ai.messages import ModelMessage, ModelResponse, TextPart, ToolCallPart
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+WORDS = (
+    "engineer manager platform product company team lead data cloud security "
+    "startup growth research design infrastructure director founder customer "
+    "sales marketing operations strategy analytics mobile backend frontend"
+).split()
+
+
+def filler_text(seed: str, chars: int) -> str:
+    """Return about `chars` characters of deterministic filler text."""
+    rng = random.Random(seed)
+    words: list[str] = []
+    length = 0
+    while length < chars:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:chars]
+
+
+class StubSearchClient:
+    """Tavily client returning generated results after a fixed latency."""
+
+    def __init__(
+        self,
+        latency: float = 0.02,
+        results: int = 5,
+        content_chars: int = 500,
+        raw_content_chars: int = 8_000,
+    ):
+        self.latency = latency
+        self.results = results
+        self.content_chars = content_chars
+        self.raw_content_chars = raw_content_chars
+        self.calls = 0
+
+    async def search(self, query: str, **kwargs: Any) -> dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return {
+            "query": query,
+            "results": [
+                {
+                    "url": f"https://example.com/{zlib.crc32(query.encode())}/{i}",
+                    "title": f"Result {i} for {query}",
+                    "content": filler_text(f"{query}:{i}", self.content_chars),
+                    "score": 1 / (i + 1),
+                    "raw_content": filler_text(
+                        f"{query}:{i}:raw", self.raw_content_chars
+                    ),
+                }
+                for i in range(self.results)
+            ],
+        }
+
+
+def stub_model(
+    result: Callable[[], BaseModel | str], latency: float = 0.02
+) -> FunctionModel:
+    """Create a model that returns `result()` after `latency` seconds.
+
+    Structured results are returned through the agent's result tool, text
+    results as plain text.
+    """
+
+    async def respond(messages: list[ModelMessage], info: AgentInfo) -> ModelResponse:
+        await asyncio.sleep(latency)
+        data = result()
+        if isinstance(data, str):
+            return ModelResponse(parts=[TextPart(data)])
+        tool = info.result_tools[0]
+        return ModelResponse(
+            parts=[ToolCallPart.from_raw_args(tool.name, data.model_dump_json())]
+        )
+
+    return FunctionModel(respond)
@@ -1,51 +1,176 @@
 import argparse
-import asyncio
+import sys
+from typing import TYPE_CHECKING, Any
 
-import logfire
+if TYPE_CHECKING:
+    from .deps import ResearchDeps
+    from .research import Researcher, research_people, research_person
+    from .telemetry import TelemetrySettings
 
-from people_researcher.nodes import GenerateQueries
+__all__ = ["Researcher", "main", "research_people", "research_person"]
 
-from .graph import create_research_graph
-from .state import PersonInfo, PersonState, UserNotes
 
-logfire.configure(scrubbing=False)
+def __getattr__(name: str) -> Any:
+    # Import the research machinery (pydantic-ai, logfire, tavily) on first use
+    # so the CLI and short-lived workers don't pay for it up front
+    if name in ("Researcher", "research_people", "research_person"):
+        from . import research
 
+        return getattr(research, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-async def research_person(
-    email: str,
-    name: str | None = None,
-    company: str | None = None,
-    linkedin: str | None = None,
-    role: str | None = None,
-    user_notes: UserNotes | None = None,
-) -> PersonInfo:
-    """Research a person and return structured information about them."""
-    with logfire.span("research_person", email=email, name=name):
-        # Initialize state
-        state = PersonState(
-            email=email,
-            name=name,
-            company=company,
-            linkedin=linkedin,
-            role=role,
-            user_notes=user_notes,
-        )
 
-        logfire.info("initialized research for {email}", email=email)
+def _add_research_options(parser: argparse.ArgumentParser) -> None:
+    """Add options shared by every command that runs research."""
+    # Caching
+    parser.add_argument(
+        "--search-cache",
+        type=str,
+        help="Path to a SQLite file for caching search results between runs",
+    )
+    parser.add_argument(
+        "--llm-cache",
+        type=str,
+        help="Path to a SQLite file for caching model responses between runs",
+    )
+
+    # Connection pooling
+    parser.add_argument(
+        "--max-connections",
+        type=int,
+        help="Maximum open HTTP connections to each of Tavily and OpenAI "
+        "(default: 4 per request in flight)",
+    )
+    parser.add_argument(
+        "--max-keepalive",
+        type=int,
+        default=20,
+        help="Maximum idle HTTP connections kept open to each of Tavily and OpenAI",
+    )
+
+    # Rate limiting
+    parser.add_argument(
+        "--search-rate",
+        type=float,
+        help="Maximum Tavily searches per second",
+    )
+    parser.add_argument(
+        "--llm-rate",
+        type=float,
+        help="Maximum OpenAI requests per second",
+    )
+    parser.add_argument(
+        "--llm-tokens-per-minute",
+        type=float,
+        help="Maximum OpenAI tokens per minute (requires --llm-rate)",
+    )
+
+    # Search resilience
+    parser.add_argument(
+        "--search-timeout",
+        type=float,
+        default=30.0,
+        help="Seconds before a search attempt is abandoned and retried",
+    )
+    parser.add_argument(
+        "--search-retries",
+        type=int,
+        default=2,
+        help="Retries with jittered backoff for failed or timed out searches",
+    )
+    parser.add_argument(
+        "--hedge-percentile",
+        type=float,
+        help="Send a duplicate search once one is slower than this latency "
+        "percentile (0-1) of recent searches",
+    )
+    parser.add_argument(
+        "--min-search-success",
+        type=float,
+        default=0.5,
+        help="Fraction (0-1) of searches that must succeed to continue "
+        "without the failed ones",
+    )
+
+    # Research tuning
+    parser.add_argument(
+        "--notes-group-size",
+        type=int,
+        help="Summarize sources concurrently in groups of this size",
+    )
+    parser.add_argument(
+        "--incremental-extraction",
+        action="store_true",
+        help="Update extracted info from only the newest notes on later cycles",
+    )
+    parser.add_argument(
+        "--reflection-queries",
+        choices=["reuse", "regenerate"],
+        default="reuse",
+        help="Reuse the queries suggested by reflection or regenerate them",
+    )
+    parser.add_argument(
+        "--no-completeness-check",
+        action="store_true",
+        help="Always ask the reflection agent, even when every field is populated",
+    )
+
+    # Telemetry
+    parser.add_argument(
+        "--telemetry-level",
+        choices=["debug", "info"],
+        default="debug",
+        help="Emit debug events and large payloads, or only spans and info events",
+    )
+    parser.add_argument(
+        "--telemetry-sample-rate",
+        type=float,
+        default=1.0,
+        help="Fraction (0-1) of research traces sent to logfire",
+    )
 
-        # Create and run graph
-        graph = create_research_graph()
-        result, _ = await graph.run(GenerateQueries(), state=state)
 
-        print(result)
+def _parse_serve_args(argv: list[str]) -> argparse.Namespace:
+    """Parse command line arguments for the `serve` command."""
+    parser = argparse.ArgumentParser(
+        prog="people-researcher serve",
+        description="Serve research requests over HTTP.",
+    )
+    parser.add_argument(
+        "--host", type=str, default="127.0.0.1", help="Interface to listen on"
+    )
+    parser.add_argument("--port", type=int, default=8000, help="TCP port to listen on")
+    parser.add_argument(
+        "--unix-socket", type=str, help="Listen on this Unix socket instead of TCP"
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of requests researched at once",
+    )
+    parser.add_argument(
+        "--max-queue",
+        type=int,
+        default=100,
+        help="Maximum number of queued requests before rejecting new ones",
+    )
+    _add_research_options(parser)
+    parser.set_defaults(command="serve")
 
-        logfire.info("completed research for {result}", result=result)
-        return result
+    return parser.parse_args(argv)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Parse command line arguments."""
-    parser = argparse.ArgumentParser(description="Research information about a person.")
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        return _parse_serve_args(argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Research information about a person.",
+        epilog="Run `people-researcher serve --help` to serve requests over HTTP.",
+    )
 
     # Required arguments
     parser.add_argument("--email", type=str, help="Email address of the person")
@@ -57,12 +182,105 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--role", type=str, help="Professional role or title")
     parser.add_argument("--notes", type=str, help="Additional notes about the person")
 
-    return parser.parse_args()
+    # Batch mode
+    parser.add_argument(
+        "--input",
+        type=str,
+        help="CSV or JSONL file of people to research instead of a single person",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="JSONL file to stream batch results to (default: stdout)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=10,
+        help="Maximum number of people researched at once in batch mode",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Worker processes to shard batch rows across, each running up to "
+        "--max-concurrency at once",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        help="SQLite journal to checkpoint batch progress in and resume from",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus metrics on this port during a batch run",
+    )
+    parser.add_argument(
+        "--metrics-host",
+        type=str,
+        default="127.0.0.1",
+        help="Interface to serve metrics on, e.g. 0.0.0.0 to allow remote scrapes",
+    )
 
+    _add_research_options(parser)
+    parser.set_defaults(command="research")
 
-def main() -> None:
-    """Main function to run the research_person coroutine."""
-    args = parse_args()
+    return parser.parse_args(argv)
+
+
+def _create_deps(args: argparse.Namespace) -> "ResearchDeps":
+    """Create research dependencies from parsed command line arguments."""
+    from .cache import SqliteCache
+    from .completeness import CompletenessPolicy
+    from .deps import ResearchDeps
+    from .ratelimit import RateLimiter
+
+    return ResearchDeps(
+        search_cache=SqliteCache(args.search_cache) if args.search_cache else None,
+        llm_cache=SqliteCache(args.llm_cache) if args.llm_cache else None,
+        search_limiter=RateLimiter("tavily", args.search_rate)
+        if args.search_rate
+        else None,
+        llm_limiter=RateLimiter(
+            "openai", args.llm_rate, tokens_per_minute=args.llm_tokens_per_minute
+        )
+        if args.llm_rate
+        else None,
+        search_timeout=args.search_timeout,
+        search_retries=args.search_retries,
+        search_hedge_percentile=args.hedge_percentile,
+        min_search_success=args.min_search_success,
+        notes_group_size=args.notes_group_size,
+        incremental_extraction=args.incremental_extraction,
+        reflection_queries=args.reflection_queries,
+        completeness=None if args.no_completeness_check else CompletenessPolicy(),
+    )
+
+
+def _pooled_researcher(args: argparse.Namespace) -> "Researcher":
+    """Create a researcher with pooled clients sized by command line arguments."""
+    from .research import Researcher
+
+    return Researcher.pooled(
+        _create_deps(args),
+        max_connections=args.max_connections or args.max_concurrency * 4,
+        max_keepalive_connections=args.max_keepalive,
+    )
+
+
+def _telemetry_settings(args: argparse.Namespace) -> "TelemetrySettings":
+    """Create telemetry settings from parsed command line arguments."""
+    from .telemetry import TelemetrySettings
+
+    return TelemetrySettings(
+        level=args.telemetry_level, sample_rate=args.telemetry_sample_rate
+    )
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Research the person described by parsed command line arguments."""
+    from .state import PersonState, UserNotes
 
     # Convert string notes to UserNotes if provided
     user_notes = (
@@ -71,8 +289,58 @@ def main() -> None:
         else None
     )
 
-    asyncio.run(
-        research_person(
+    if args.input and args.workers > 1:
+        import functools
+
+        from .workers import run_batch_workers
+
+        await run_batch_workers(
+            functools.partial(_create_deps, args),
+            args.input,
+            args.output,
+            workers=args.workers,
+            max_concurrency=args.max_concurrency,
+            journal_path=args.journal,
+            metrics_port=args.metrics_port,
+            metrics_host=args.metrics_host,
+            telemetry=_telemetry_settings(args),
+            max_connections=args.max_connections,
+            max_keepalive_connections=args.max_keepalive,
+        )
+        return
+
+    if args.input:
+        from .batch import run_batch
+        from .journal import BatchJournal
+
+        journal = BatchJournal(args.journal) if args.journal else None
+        metrics_server = None
+        if args.metrics_port is not None:
+            import asyncio
+
+            from .metrics import serve_metrics
+
+            metrics_server = asyncio.create_task(
+                serve_metrics(host=args.metrics_host, port=args.metrics_port)
+            )
+        try:
+            async with _pooled_researcher(args) as researcher:
+                await run_batch(
+                    researcher,
+                    args.input,
+                    args.output,
+                    args.max_concurrency,
+                    journal=journal,
+                )
+        finally:
+            if metrics_server is not None:
+                metrics_server.cancel()
+            if journal is not None:
+                journal.close()
+        return
+
+    async with _pooled_researcher(args) as researcher:
+        state = PersonState(
             email=args.email,
             name=args.name,
             company=args.company,
@@ -80,7 +348,36 @@ def main() -> None:
             role=args.role,
             user_notes=user_notes,
         )
-    )
+        print(await researcher.research(state))
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """Run the HTTP research service until interrupted."""
+    from .server import ResearchServer
+
+    async with _pooled_researcher(args) as researcher:
+        server = ResearchServer(
+            researcher,
+            max_concurrency=args.max_concurrency,
+            max_queue=args.max_queue,
+        )
+        await server.serve(args.host, args.port, args.unix_socket)
+
+
+def main() -> None:
+    """Main function to run the research_person coroutine."""
+    args = parse_args()
+
+    from .telemetry import configure_telemetry
+
+    configure_telemetry(_telemetry_settings(args))
+
+    import asyncio
+
+    try:
+        asyncio.run(_serve(args) if args.command == "serve" else _main(args))
+    except KeyboardInterrupt:
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+import sys
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator
+from pathlib import Path
+from typing import Any, TextIO
+
+import logfire
+
+from .journal import BatchJournal
+from .research import Researcher, bounded_map
+from .state import PersonInfo, PersonState, UserNotes
+from .telemetry import configure_telemetry
+
+# Input columns understood in CSV headers and JSONL keys
+INPUT_FIELDS = ("email", "name", "company", "linkedin", "role", "notes")
+
+
+def person_from_row(row: dict[str, Any]) -> PersonState:
+    """Create the initial state for one input row.
+
+    Empty values are treated as missing; `notes` becomes the user notes.
+    """
+    values = {
+        key: str(row[key]).strip() or None for key in INPUT_FIELDS if row.get(key)
+    }
+    notes = values.pop("notes", None)
+    return PersonState(
+        email=values.get("email"),
+        name=values.get("name"),
+        company=values.get("company"),
+        linkedin=values.get("linkedin"),
+        role=values.get("role"),
+        user_notes=UserNotes(additional=notes, context="default_context")
+        if notes
+        else None,
+    )
+
+
+def person_to_row(state: PersonState) -> dict[str, str | None]:
+    """Return the input fields of a state, as read by `person_from_row`."""
+    return {
+        "email": state.email,
+        "name": state.name,
+        "company": state.company,
+        "linkedin": state.linkedin,
+        "role": state.role,
+        "notes": state.user_notes.additional if state.user_notes else None,
+    }
+
+
+def read_people(
+    path: str | Path, shard: int = 0, shards: int = 1
+) -> Iterator[PersonState]:
+    """Stream people from a `.csv` or `.jsonl` file one row at a time.
+
+    With more than one shard, only rows whose raw content hashes to `shard`
+    are parsed into states, so each of `shards` readers of the same file gets
+    a disjoint share without validating everyone else's rows, and identical
+    rows always land in the same shard.
+    """
+    if not 0 <= shard < shards:
+        raise ValueError(f"shard must be between 0 and {shards - 1}: {shard}")
+
+    def in_shard(raw: str) -> bool:
+        return shards == 1 or zlib.crc32(raw.encode()) % shards == shard
+
+    path = Path(path)
+    with path.open(newline="") as f:
+        if path.suffix == ".csv":
+            reader = csv.reader(f)
+            header = next(reader, None)
+            for values in reader:
+                if values and in_shard("\x1f".join(values)):
+                    yield person_from_row(dict(zip(header or [], values)))
+        elif path.suffix in (".jsonl", ".ndjson"):
+            for line in f:
+                line = line.strip()
+                if line and in_shard(line):
+                    yield person_from_row(json.loads(line))
+        else:
+            raise ValueError(f"unsupported input format: {path.suffix}")
+
+
+def format_result(state: PersonState, result: PersonInfo | Exception) -> str:
+    """Return one result, or the error of a failed row, as a JSON line.
+
+    The input fields and run report are included either way, so failed rows
+    can be found and retried from the output alone.
+    """
+    record: dict[str, Any] = person_to_row(state)
+    if isinstance(result, Exception):
+        record["error"] = f"{type(result).__name__}: {result}"
+    else:
+        record["info"] = result.model_dump(mode="json")
+    record["report"] = state.report.model_dump(mode="json")
+    return json.dumps(record) + "\n"
+
+
+def write_result(
+    output: TextIO, state: PersonState, result: PersonInfo | Exception
+) -> None:
+    """Write one result as a JSON line and flush it immediately."""
+    output.write(format_result(state, result))
+    output.flush()
+
+
+def journal_key(state: PersonState) -> str:
+    """Return a stable key identifying an input row in a `BatchJournal`."""
+    row = json.dumps(person_to_row(state), sort_keys=True)
+    return hashlib.sha256(row.encode()).hexdigest()
+
+
+def research_rows(
+    researcher: Researcher,
+    people: Iterable[PersonState],
+    max_concurrency: int,
+    journal: BatchJournal | None = None,
+) -> AsyncIterator[tuple[PersonState, PersonInfo | Exception]]:
+    """Research input rows concurrently, resuming from `journal` if given.
+
+    A row that fails is logged and yields its exception in place of a result,
+    so one bad row never aborts the rows still in flight.
+
+    Rows aren't marked as completed in the journal; call `set_result()` once
+    each result has been written out.
+    """
+    in_flight: set[str] = set()
+    if journal is not None:
+        # Share the researcher's graph and deps but checkpoint into the journal
+        researcher = Researcher(
+            researcher.deps, graph=researcher.graph, snapshot_store=journal
+        )
+        people = _pending_rows(people, journal, in_flight)
+
+    async def research_row(state: PersonState) -> PersonInfo:
+        key = journal_key(state) if journal is not None else None
+        try:
+            return await researcher.research(state, run_id=key)
+        finally:
+            if key is not None:
+                in_flight.discard(key)
+
+    return bounded_map(research_row, people, max_concurrency)
+
+
+def _pending_rows(
+    people: Iterable[PersonState], journal: BatchJournal, in_flight: set[str]
+) -> Iterator[PersonState]:
+    """Yield rows not completed by a previous run, adding their keys to `in_flight`.
+
+    Duplicates of a row still in flight are skipped too, as they would share
+    its snapshot. Rows are only pulled once every finished row has been
+    yielded and recorded, so a duplicate arriving later is caught by the
+    journal instead.
+    """
+    for state in people:
+        key = journal_key(state)
+        if key in in_flight or journal.get_result(key) is not None:
+            continue
+        in_flight.add(key)
+        yield state
+
+
+async def run_batch(
+    researcher: Researcher,
+    input_path: str | Path,
+    output_path: str | Path | None = None,
+    max_concurrency: int = 10,
+    journal: BatchJournal | None = None,
+) -> int:
+    """Research every person in `input_path` and stream results as JSONL.
+
+    Rows are read lazily and each result is written as soon as it completes,
+    so memory use stays constant regardless of input size. Rows that fail are
+    written as error records and the batch carries on.
+
+    With a journal, rows completed by a previous run are skipped, rows that
+    were in flight resume from their last completed node, and results are
+    appended to `output_path` rather than overwriting it.
+
+    Args:
+        researcher: Researcher to run every row with.
+        input_path: `.csv` or `.jsonl` file of people.
+        output_path: JSONL file to write results to, or stdout if `None`.
+        max_concurrency: Maximum number of rows researched at once.
+        journal: Journal to record progress in and resume from.
+
+    Returns:
+        The number of rows researched, including failed ones.
+    """
+    configure_telemetry()
+    count = failed = 0
+    with logfire.span("run_batch", input_path=str(input_path)):
+        results = research_rows(
+            researcher, read_people(input_path), max_concurrency, journal
+        )
+
+        mode = "a" if journal is not None else "w"
+        output = open(output_path, mode) if output_path is not None else sys.stdout
+        try:
+            async for state, result in results:
+                write_result(output, state, result)
+                if journal is not None and not isinstance(result, Exception):
+                    await journal.set_result(journal_key(state), result)
+                count += 1
+                failed += isinstance(result, Exception)
+        finally:
+            if output is not sys.stdout:
+                output.close()
+
+        logfire.info(
+            "researched {count} people, {failed} failed", count=count, failed=failed
+        )
+    return count
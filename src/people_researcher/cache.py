@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Generic, Protocol, TypeVar
+
+import logfire
+from pydantic import TypeAdapter
+
+from pydantic_ai import Agent
+from pydantic_ai.models import KnownModelName, Model
+from pydantic_ai.usage import Usage
+
+from .ratelimit import RateLimiter
+from .tokens import count_tokens
+
+ResultT = TypeVar("ResultT")
+
+# Fraction of `SqliteCache.max_entries` evicted beyond what's needed, so rows
+# are only recounted once every so many inserts
+EVICTION_HEADROOM = 0.1
+
+agent_cache_hits = logfire.metric_counter(
+    "agent_cache_hits", unit="1", description="Agent runs served from the cache"
+)
+agent_cache_misses = logfire.metric_counter(
+    "agent_cache_misses", unit="1", description="Agent runs sent to the model"
+)
+
+
+class Cache(Protocol):
+    """Key/value store for serialized responses."""
+
+    async def get(self, key: str) -> bytes | None:
+        """Return the cached value for `key`, or `None` if missing or expired."""
+        ...
+
+    async def set(self, key: str, value: bytes) -> None:
+        """Store `value` under `key`, evicting old entries if needed."""
+        ...
+
+
+class MemoryCache:
+    """In-process LRU cache with optional TTL."""
+
+    def __init__(self, max_entries: int = 1024, ttl: float | None = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if self.ttl is not None and time.time() - created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: bytes) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SqliteCache:
+    """Persistent on-disk LRU cache with optional TTL backed by SQLite.
+
+    Queries run in a worker thread so they don't block the event loop. Reads
+    don't write: access times are buffered and written in one transaction
+    with the next `set()`, or once `access_batch_size` reads have piled up,
+    so recency is approximate between flushes. Expired entries are left in
+    place until they're overwritten or evicted.
+
+    Several processes can share one file. Each tracks the row count from its
+    own inserts and recounts before evicting, so the table can only exceed
+    `max_entries` by what other processes inserted since their last eviction.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = 100_000,
+        ttl: float | None = 7 * 24 * 60 * 60,
+        access_batch_size: int = 100,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.access_batch_size = access_batch_size
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._accessed: dict[str, float] = {}
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                created REAL NOT NULL,
+                accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed)"
+        )
+        self._conn.commit()
+        # Tracked rather than counted on every write, and recounted once it
+        # crosses the bound to take other processes' inserts into account
+        self._count = self._row_count()
+
+    async def get(self, key: str) -> bytes | None:
+        return await asyncio.to_thread(self._get, key)
+
+    async def set(self, key: str, value: bytes) -> None:
+        await asyncio.to_thread(self._set, key, value)
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+    def _get(self, key: str) -> bytes | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, created FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            value, created = row
+            if self.ttl is not None and now - created > self.ttl:
+                return None
+            self._accessed[key] = now
+            if len(self._accessed) >= self.access_batch_size:
+                self._flush_accessed()
+                self._conn.commit()
+        return bytes(value)
+
+    def _set(self, key: str, value: bytes) -> None:
+        now = time.time()
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._flush_accessed()
+            exists = self._conn.execute(
+                "SELECT 1 FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                (key, value, now, now),
+            )
+            if exists is None:
+                self._count += 1
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _flush_accessed(self) -> None:
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE cache SET accessed = ? WHERE key = ?",
+                [(accessed, key) for key, accessed in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def _evict(self) -> None:
+        """Delete the least recently used entries beyond the size bound.
+
+        Evicts down to `EVICTION_HEADROOM` below the bound, so the next
+        recount is a while off.
+        """
+        self._count = self._row_count()
+        if self._count <= self.max_entries:
+            return
+        target = self.max_entries - int(self.max_entries * EVICTION_HEADROOM)
+        # Walks the `accessed` index from the oldest end, so only the evicted
+        # rows are visited
+        cursor = self._conn.execute(
+            """
+            DELETE FROM cache WHERE key IN (
+                SELECT key FROM cache ORDER BY accessed LIMIT ?
+            )
+            """,
+            (self._count - target,),
+        )
+        self._count -= cursor.rowcount
+
+    def _row_count(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so trivially different spellings share a cache entry."""
+    return " ".join(query.lower().split())
+
+
+def search_cache_key(query: str, **params: Any) -> str:
+    """Build a cache key from a normalized query and its search parameters."""
+    payload = json.dumps(
+        {"query": normalize_query(query), **params}, sort_keys=True, default=str
+    )
+    return "search:" + hashlib.sha256(payload.encode()).hexdigest()
+
+
+@dataclass
+class CachedAgent(Generic[ResultT]):
+    """Agent wrapper that serves byte-identical runs from a response cache.
+
+    Responses are content-addressed by the model name, system prompt, result
+    schema and user prompt, and stored as validated result data.
+    """
+
+    agent: Agent[None, ResultT]
+    result_type: type[ResultT]
+    system_prompt: str
+    _adapter: TypeAdapter[ResultT] = field(init=False, repr=False)
+    _fingerprint: str = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._adapter = TypeAdapter(self.result_type)
+        payload = json.dumps(
+            {
+                "system_prompt": self.system_prompt,
+                "schema": self._adapter.json_schema(),
+            },
+            sort_keys=True,
+        )
+        self._fingerprint = hashlib.sha256(payload.encode()).hexdigest()
+
+    @property
+    def name(self) -> str:
+        return self.agent.name or "agent"
+
+    def cache_key(self, user_prompt: str, model: Model | None = None) -> str:
+        """Build the content address for running this agent on `user_prompt`."""
+        selected: Model | KnownModelName | None = model or self.agent.model
+        model_name = (
+            selected
+            if isinstance(selected, str) or selected is None
+            else selected.name()
+        )
+        digest = hashlib.sha256(
+            f"{self._fingerprint}\n{model_name}\n{user_prompt}".encode()
+        )
+        return f"agent:{self.name}:{digest.hexdigest()}"
+
+    async def run(
+        self,
+        user_prompt: str,
+        cache: Cache | None = None,
+        model: Model | None = None,
+        limiter: RateLimiter | None = None,
+        usage: Usage | None = None,
+    ) -> ResultT:
+        """Run the agent, returning cached result data when available.
+
+        Args:
+            user_prompt: User input for the agent.
+            cache: Response cache to consult and populate.
+            model: Model to use instead of the agent's default.
+            limiter: Rate limiter to admit model requests through; cache hits
+                don't count against it.
+            usage: Usage to add the model's usage to; cache hits add nothing.
+        """
+        if cache is None:
+            return await self._run_model(user_prompt, model, limiter, usage)
+
+        key = self.cache_key(user_prompt, model)
+        cached = await cache.get(key)
+        if cached is not None:
+            agent_cache_hits.add(1, {"agent": self.name})
+            return self._adapter.validate_json(cached)
+
+        agent_cache_misses.add(1, {"agent": self.name})
+        data = await self._run_model(user_prompt, model, limiter, usage)
+        await cache.set(key, self._adapter.dump_json(data))
+        return data
+
+    async def _run_model(
+        self,
+        user_prompt: str,
+        model: Model | None,
+        limiter: RateLimiter | None,
+        usage: Usage | None,
+    ) -> ResultT:
+        if limiter is None:
+            result = await self.agent.run(user_prompt, model=model)
+        else:
+            # Reserve the prompt up front and settle the actual usage afterwards
+            estimate = count_tokens(self.system_prompt) + count_tokens(user_prompt)
+            await limiter.acquire(estimate)
+            result = await self.agent.run(user_prompt, model=model)
+            run_usage = result.usage()
+            limiter.consume(
+                tokens=(run_usage.total_tokens or estimate) - estimate,
+                requests=(run_usage.requests or 1) - 1,
+            )
+
+        if usage is not None:
+            usage.incr(result.usage())
+        return result.data
+
+
+def cached_agent(
+    model: KnownModelName,
+    *,
+    result_type: type[ResultT],
+    name: str,
+    system_prompt: str,
+) -> CachedAgent[ResultT]:
+    """Create an agent whose runs can be served from a response cache.
+
+    The model client is only constructed on the agent's first run.
+    """
+    return CachedAgent(
+        Agent(
+            model,
+            result_type=result_type,
+            name=name,
+            system_prompt=system_prompt,
+            defer_model_check=True,
+        ),
+        result_type=result_type,
+        system_prompt=system_prompt,
+    )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator, Callable
+from contextlib import asynccontextmanager
+from types import TracebackType
+from typing import Any
+
+import httpx
+from tavily import AsyncTavilyClient
+
+from pydantic_ai.models.openai import OpenAIModel
+
+from .ratelimit import RateLimiter
+
+TAVILY_BASE_URL = "https://api.tavily.com"
+
+
+def _response_hooks(
+    limiter: RateLimiter | None,
+) -> dict[str, list[Callable[..., Any]]] | None:
+    return {"response": [limiter.observe_response]} if limiter else None
+
+
+class PooledTavilyClient(AsyncTavilyClient):
+    """Tavily client that reuses a shared HTTP connection pool.
+
+    The stock client opens (and tears down) a new `httpx.AsyncClient` for every
+    search, paying a fresh TCP and TLS handshake each time. This replaces the
+    private factory it uses for that, which `tavily-python` is pinned below
+    0.6 for.
+    """
+
+    def __init__(self, http_client: httpx.AsyncClient, api_key: str | None = None):
+        super().__init__(api_key=api_key)
+        if not hasattr(self, "_client_creator"):
+            raise RuntimeError(
+                "this tavily-python version doesn't create HTTP clients through "
+                "`_client_creator`, so searches can't share a connection pool"
+            )
+
+        @asynccontextmanager
+        async def borrow_client() -> AsyncGenerator[httpx.AsyncClient]:
+            # Hand out the shared client without closing it afterwards
+            yield http_client
+
+        self._client_creator = borrow_client
+
+
+class PooledClients:
+    """Tavily and OpenAI clients sharing long-lived HTTP connection pools.
+
+    Create one per process (or service) and close it on shutdown, either with
+    `aclose()` or by using it as an async context manager.
+
+    Rate limiters passed in observe every response from their provider, so
+    they can back off on 429s and exhausted rate limit headers.
+    """
+
+    def __init__(
+        self,
+        model_name: str = "gpt-4o",
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        search_limiter: RateLimiter | None = None,
+        llm_limiter: RateLimiter | None = None,
+    ):
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+        )
+        self._tavily_http = httpx.AsyncClient(
+            base_url=TAVILY_BASE_URL,
+            headers={"Content-Type": "application/json"},
+            timeout=180,
+            limits=limits,
+            event_hooks=_response_hooks(search_limiter),
+        )
+        self._openai_http = httpx.AsyncClient(
+            timeout=httpx.Timeout(timeout=600, connect=5),
+            limits=limits,
+            event_hooks=_response_hooks(llm_limiter),
+        )
+
+        self.search_client = PooledTavilyClient(self._tavily_http)
+        self.model = OpenAIModel(model_name, http_client=self._openai_http)
+
+    async def aclose(self) -> None:
+        """Close the underlying connection pools."""
+        await self._tavily_http.aclose()
+        await self._openai_http.aclose()
+
+    async def __aenter__(self) -> PooledClients:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from .state import PersonInfo
+
+# Placeholder values the extraction agent uses for facts it couldn't find
+UNKNOWN_VALUES = frozenset(
+    {"", "unknown", "n/a", "na", "none", "not available", "no information available"}
+)
+
+DEFAULT_FIELD_WEIGHTS: Mapping[str, float] = {
+    "years_experience": 1.0,
+    "current_company": 1.0,
+    "role": 1.0,
+    "prior_companies": 1.0,
+    "notes": 0.5,
+}
+
+Verdict = Literal["complete", "incomplete", "uncertain"]
+
+
+def is_populated(value: Any) -> bool:
+    """Whether an extracted field holds a real value rather than a placeholder."""
+    if isinstance(value, str):
+        return value.strip().lower() not in UNKNOWN_VALUES
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int | float):
+        return value > 0
+    if isinstance(value, list | tuple | set | dict):
+        return len(value) > 0  # pyright: ignore[reportUnknownArgumentType]
+    return value is not None
+
+
+@dataclass(frozen=True)
+class CompletenessPolicy:
+    """Deterministic completeness check run before the reflection agent.
+
+    Each `PersonInfo` field contributes its weight to the score when it is
+    populated. Info scoring at least `complete_threshold` ends the run and
+    info scoring below `incomplete_threshold` starts another cycle, both
+    without a model call; anything in between is left to the reflection agent.
+    """
+
+    # Weight of each PersonInfo field in the score; unlisted fields are ignored
+    weights: Mapping[str, float] = field(
+        default_factory=lambda: dict(DEFAULT_FIELD_WEIGHTS)
+    )
+
+    # Fractions (0-1) of the total weight, or None to disable that shortcut
+    complete_threshold: float | None = 1.0
+    incomplete_threshold: float | None = None
+
+    def __post_init__(self) -> None:
+        unknown = set(self.weights) - set(PersonInfo.model_fields)
+        if unknown:
+            raise ValueError(f"unknown PersonInfo fields: {sorted(unknown)}")
+
+    def missing_fields(self, info: PersonInfo | None) -> list[str]:
+        """Return the weighted fields of `info` that aren't populated."""
+        if info is None:
+            return [name for name, weight in self.weights.items() if weight > 0]
+        return [
+            name
+            for name, weight in self.weights.items()
+            if weight > 0 and not is_populated(getattr(info, name))
+        ]
+
+    def score(self, info: PersonInfo | None) -> float:
+        """Return the populated fraction (0-1) of the total field weight."""
+        total = sum(weight for weight in self.weights.values() if weight > 0)
+        if total == 0:
+            return 0.0
+        missing = sum(self.weights[name] for name in self.missing_fields(info))
+        return (total - missing) / total
+
+    def assess(self, info: PersonInfo | None) -> Verdict:
+        """Decide whether `info` is clearly complete, clearly incomplete, or unclear."""
+        score = self.score(info)
+        if self.complete_threshold is not None and score >= self.complete_threshold:
+            return "complete"
+        if self.incomplete_threshold is not None and score < self.incomplete_threshold:
+            return "incomplete"
+        return "uncertain"
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Literal
+
+from tavily import AsyncTavilyClient
+
+from pydantic_ai.models import Model
+
+from .cache import Cache
+from .completeness import CompletenessPolicy
+from .ratelimit import RateLimiter
+from .retry import LatencyTracker
+
+
+@dataclass
+class ResearchDeps:
+    """Dependencies shared by every node in a research graph run."""
+
+    # Clients to use instead of the module defaults, e.g. from PooledClients
+    search_client: AsyncTavilyClient | None = None
+    model: Model | None = None
+
+    search_cache: Cache | None = None
+    llm_cache: Cache | None = None
+
+    # Per-provider rate limiters shared by every search and agent call
+    search_limiter: RateLimiter | None = None
+    llm_limiter: RateLimiter | None = None
+
+    # Search resilience: seconds before an attempt is abandoned, retries with
+    # jittered backoff, and the latency percentile (0-1) after which a
+    # duplicate request is hedged, or None to never hedge
+    search_timeout: float | None = 30.0
+    search_retries: int = 2
+    search_hedge_percentile: float | None = None
+    search_latency: LatencyTracker = field(default_factory=LatencyTracker)
+
+    # Fraction of a cycle's searches that must succeed for research to carry
+    # on without the failed ones; below it, a run with no info yet fails
+    min_search_success: float = 0.5
+
+    # Total token budget for the sources sent to the research notes agent,
+    # or None to cut each source to a fixed size independently
+    source_token_budget: int | None = 8_000
+
+    # Number of sources summarized per concurrent research notes agent call,
+    # or None to summarize all sources in a single call
+    notes_group_size: int | None = None
+
+    # Update the previous extraction from only the newest notes on later
+    # cycles instead of re-extracting from every note
+    incremental_extraction: bool = False
+
+    # What to do with the search queries suggested by reflection: "reuse" runs
+    # them directly, "regenerate" asks the query agent for a fresh set
+    reflection_queries: Literal["reuse", "regenerate"] = "reuse"
+
+    # Deterministic completeness check that can end the run, or force another
+    # cycle, without calling the reflection agent; None always calls it
+    completeness: CompletenessPolicy | None = field(default_factory=CompletenessPolicy)
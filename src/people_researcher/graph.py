@@ -1,13 +1,21 @@
 from pydantic_graph import Graph
 
+from .deps import ResearchDeps
 from .nodes import Extract, GenerateQueries, Reflect, Research
 from .state import PersonInfo, PersonState
 
 
-def create_research_graph() -> Graph[PersonState, None, PersonInfo]:
+def create_research_graph() -> Graph[PersonState, ResearchDeps, PersonInfo]:
     """Create the research workflow graph.
 
     Returns:
         Graph instance configured for person research
     """
-    return Graph(nodes=[GenerateQueries, Research, Extract, Reflect])
+    return Graph(
+        nodes=[GenerateQueries, Research, Extract, Reflect],
+        name="research_graph",
+    )
+
+
+# Graphs are stateless between runs, so one instance is shared by every run
+research_graph = create_research_graph()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from pathlib import Path
+
+from .snapshots import SqliteSnapshotStore
+from .state import PersonInfo
+
+
+class BatchJournal(SqliteSnapshotStore):
+    """Durable record of batch progress backed by SQLite.
+
+    Completed rows are stored with their `PersonInfo` so a restarted batch can
+    skip them. As a snapshot store, it also checkpoints rows still in flight
+    after every graph node, so they resume from the last completed node
+    instead of starting over.
+    """
+
+    def __init__(self, path: str | Path):
+        super().__init__(path)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS results (
+                key TEXT PRIMARY KEY,
+                info BLOB NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_result(self, key: str) -> PersonInfo | None:
+        """Return the result of a completed row, or `None` if it hasn't finished.
+
+        Only reads, so it's cheap enough to call from the event loop.
+        """
+        row = self._fetch_one("SELECT info FROM results WHERE key = ?", (key,))
+        return PersonInfo.model_validate_json(row[0]) if row else None
+
+    async def set_result(self, key: str, info: PersonInfo) -> None:
+        """Mark a row as completed, dropping its snapshot in the same transaction.
+
+        Call this only once the row's result has been durably written out, so a
+        crash in between replays the row rather than losing it.
+        """
+        await asyncio.to_thread(
+            self._write,
+            (
+                "INSERT OR REPLACE INTO results (key, info, updated) VALUES (?, ?, ?)",
+                (key, info.model_dump_json(), time.time()),
+            ),
+            ("DELETE FROM snapshots WHERE run_id = ?", (key,)),
+        )
+
+    async def delete(self, run_id: str) -> None:
+        """Keep the snapshot of a finished run until `set_result()` drops it.
+
+        A researcher deletes its snapshot as soon as the graph ends, before
+        the result has been written out; keeping it means a row interrupted in
+        between resumes from its last node instead of starting over.
+        """
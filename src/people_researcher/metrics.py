@@ -0,0 +1,247 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import ClassVar, TypeVar
+
+M = TypeVar("M", bound="Metric")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds, from cache hits up to slow model calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return "{" + pairs + "}"
+
+
+class Metric(ABC):
+    """Base class for a metric family with a fixed set of label names."""
+
+    type: ClassVar[str]
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        if labels.keys() != set(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}, got {labels}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    @abstractmethod
+    def samples(self) -> list[str]:
+        """Return the exposition lines for every labelled series."""
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        return "\n".join(lines + self.samples())
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: count per bucket (plus +Inf), sum and count
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def samples(self) -> list[str]:
+        lines: list[str] = []
+        bucket_labels = (*self.labels, "le")
+        for key, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += count
+                labels = _format_labels(bucket_labels, (*key, _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """Collection of metrics rendered together on a scrape.
+
+    Metrics are kept in process and rendered in the Prometheus text exposition
+    format, which OpenMetrics scrapers also accept, so a worker fleet can be
+    monitored without a hosted telemetry backend. `ResearchServer` exposes the
+    default registry on `GET /metrics`, and `serve_metrics()` on a standalone
+    port.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        return "".join(metric.render() + "\n" for metric in self._metrics.values())
+
+
+REGISTRY = Registry()
+
+research_runs = REGISTRY.register(
+    Counter("research_runs_total", "Completed graph runs by outcome", ["outcome"])
+)
+research_in_flight = REGISTRY.register(
+    Gauge("research_in_flight", "Graph runs currently in progress")
+)
+research_seconds = REGISTRY.register(
+    Histogram("research_seconds", "Wall time of graph runs")
+)
+node_seconds = REGISTRY.register(
+    Histogram("research_node_seconds", "Wall time of graph node visits", ["node"])
+)
+search_requests = REGISTRY.register(
+    Counter(
+        "search_requests_total",
+        "Searches by where they were served from, tavily or cache",
+        ["source"],
+    )
+)
+search_errors = REGISTRY.register(
+    Counter("search_errors_total", "Searches that failed after retries")
+)
+agent_runs = REGISTRY.register(
+    Counter(
+        "agent_runs_total",
+        "Agent runs by whether they were served from the cache",
+        ["agent", "cached"],
+    )
+)
+agent_tokens = REGISTRY.register(
+    Counter(
+        "agent_tokens_total",
+        "Model tokens used by agent and direction, input or output",
+        ["agent", "direction"],
+    )
+)
+server_queue_depth = REGISTRY.register(
+    Gauge("server_queue_depth", "Research requests waiting for a server worker")
+)
+
+
+async def _handle_scrape(
+    reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+) -> None:
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split(" ")
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+            status, content_type = "200 OK", CONTENT_TYPE
+            body = REGISTRY.render().encode()
+        else:
+            status, content_type = "404 Not Found", "text/plain"
+            body = b"not found\n"
+        writer.write(
+            (
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+            ).encode("latin-1")
+            + body
+        )
+        await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve_metrics(host: str = "127.0.0.1", port: int = 9100) -> None:
+    """Serve `GET /metrics` on a standalone port until cancelled."""
+    server = await asyncio.start_server(_handle_scrape, host=host, port=port)
+    async with server:
+        await server.serve_forever()
@@ -1,29 +1,76 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import hashlib
+import io
 import json
-from collections.abc import Awaitable
+import math
+from collections.abc import Awaitable, Iterable, Iterator
 from dataclasses import dataclass
-from typing import NotRequired, TypedDict, cast
+from functools import cache
+from typing import Any, NotRequired, TypedDict, TypeVar, cast
 
+import httpx
 import logfire
 from pydantic import BaseModel, Field
 from pydantic_graph import BaseNode, End, GraphRunContext
-from tavily import AsyncTavilyClient
-
+from tavily import AsyncTavilyClient, UsageLimitExceededError
+
+from people_researcher.cache import CachedAgent, cached_agent, search_cache_key
+from people_researcher.deps import ResearchDeps
+from people_researcher.metrics import (
+    agent_runs,
+    agent_tokens,
+    search_errors,
+    search_requests,
+)
 from people_researcher.prompts import (
     EXTRACTION_PROMPT,
+    INCREMENTAL_EXTRACTION_PROMPT,
     INFO_PROMPT,
     QUERY_WRITER_PROMPT,
     REFLECTION_PROMPT,
 )
-from people_researcher.state import PersonInfo, PersonState
-from pydantic_ai import Agent
+from people_researcher.report import RunReport
+from people_researcher.retry import call_with_retry
+from people_researcher.state import (
+    PersonInfo,
+    PersonState,
+    SearchFailure,
+    merge_person_info,
+)
+from people_researcher.telemetry import payload, verbose
+from people_researcher.tokens import (
+    CHARS_PER_TOKEN,
+    allocate_budget,
+    count_tokens,
+    truncate_tokens,
+)
+from pydantic_ai.usage import Usage
+
+
+@cache
+def default_search_client() -> AsyncTavilyClient:
+    """Create the Tavily client used when none is supplied in the deps."""
+    return AsyncTavilyClient()
 
-# Configure logfire
-logfire.configure()
 
-tavily_client = AsyncTavilyClient()
+ResultT = TypeVar("ResultT")
+
+SEARCH_PARAMS: dict[str, Any] = {
+    "search_depth": "basic",
+    "days": 360,
+    "max_results": 3,
+    "include_raw_content": True,
+    "topic": "general",
+}
+
+# Tokens reserved per source for the raw content label and truncation marker
+RAW_CONTENT_OVERHEAD_TOKENS = 24
+
+# Floor for relevance scores so unscored sources still get some budget
+MIN_SOURCE_WEIGHT = 0.01
 
 
 class ReflectionOutput(BaseModel):
@@ -47,6 +94,7 @@ class TavilyResult(TypedDict):
     url: str
     title: str
     content: str
+    score: NotRequired[float]
     raw_content: NotRequired[str]
 
 
@@ -64,29 +112,36 @@ class Queries(BaseModel):
     )
 
 
-query_agent = Agent(
+query_agent = cached_agent(
     "openai:gpt-4o",
     result_type=Queries,
     name="query_generator",
     system_prompt=QUERY_WRITER_PROMPT,
 )
 
-research_notes_agent = Agent(
+research_notes_agent = cached_agent(
     "openai:gpt-4o",
     result_type=str,
     name="researcher",
     system_prompt=INFO_PROMPT,
 )
 
-extraction_agent = Agent(
+extraction_agent = cached_agent(
     "openai:gpt-4o",
     result_type=PersonInfo,
     name="extractor",
     system_prompt=EXTRACTION_PROMPT,
 )
 
+incremental_extraction_agent = cached_agent(
+    "openai:gpt-4o",
+    result_type=PersonInfo,
+    name="incremental_extractor",
+    system_prompt=INCREMENTAL_EXTRACTION_PROMPT,
+)
+
 
-reflection_agent = Agent(
+reflection_agent = cached_agent(
     "openai:gpt-4o",
     result_type=ReflectionOutput,
     name="reflection",
@@ -94,136 +149,511 @@ reflection_agent = Agent(
 )
 
 
-def deduplicate_and_format_sources(
-    search_response: TavilyResponse | list[TavilyResponse],
-    max_tokens: int = 1000,
-    include_raw_content: bool = True,
-) -> str:
-    """Format and deduplicate search results from Tavily."""
-    with logfire.span(
-        "deduplicating_sources",
-        num_responses=len(search_response) if isinstance(search_response, list) else 1,
-    ):
-        # Convert input to list of results
-        sources_list: list[TavilyResult] = []
-        if not isinstance(search_response, list):
-            sources_list = search_response["results"]
-        else:
-            for response in search_response:
-                sources_list.extend(response["results"])
+async def run_agent(
+    agent: CachedAgent[ResultT],
+    user_prompt: str,
+    deps: ResearchDeps,
+    report: RunReport | None = None,
+) -> ResultT:
+    """Run one of the research agents with the clients and cache from `deps`.
+
+    Args:
+        agent: Agent to run.
+        user_prompt: User input for the agent.
+        deps: Dependencies of the current graph run.
+        report: Run report to add the agent's model usage to.
+    """
+    usage = Usage()
+    data = await agent.run(
+        user_prompt,
+        cache=deps.llm_cache,
+        model=deps.model,
+        limiter=deps.llm_limiter,
+        usage=usage,
+    )
+    agent_runs.inc(agent=agent.name, cached=str(usage.requests == 0).lower())
+    agent_tokens.inc(usage.request_tokens or 0, agent=agent.name, direction="input")
+    agent_tokens.inc(usage.response_tokens or 0, agent=agent.name, direction="output")
+    if report is not None:
+        report.record_agent(agent.name, usage)
+    return data
+
+
+def is_retryable_search_error(error: BaseException) -> bool:
+    """Whether a failed search is transient: a 429, 5xx or transport error."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code >= 500
+    return isinstance(error, UsageLimitExceededError | httpx.TransportError)
+
+
+def source_bytes(response: TavilyResponse) -> int:
+    """Return the size in bytes of the source content in a search response."""
+    return sum(
+        len(result["content"].encode()) + len(result.get("raw_content", "").encode())
+        for result in response["results"]
+    )
 
-        # Deduplicate by URL
-        unique_sources: dict[str, TavilyResult] = {}
-        for source in sources_list:
-            if source["url"] not in unique_sources:
-                unique_sources[source["url"]] = source
 
-        logfire.info(
-            "deduplicated {initial} sources to {final} unique sources",
-            initial=len(sources_list),
-            final=len(unique_sources),
+async def search(
+    query: str, deps: ResearchDeps, report: RunReport | None = None
+) -> TavilyResponse:
+    """Search Tavily for `query`, reusing a cached response when available.
+
+    Args:
+        query: Search query.
+        deps: Dependencies of the current graph run.
+        report: Run report to count the search and its source content in.
+    """
+    cache = deps.search_cache
+    client = deps.search_client or default_search_client()
+    key = search_cache_key(query, **SEARCH_PARAMS)
+    if cache is not None:
+        cached = await cache.get(key)
+        if cached is not None:
+            if verbose():
+                logfire.debug("search cache hit: {query}", query=query)
+            response = cast(TavilyResponse, json.loads(cached))
+            search_requests.inc(source="cache")
+            if report is not None:
+                report.record_search(source_bytes(response), cached=True)
+            return response
+
+    async def attempt() -> TavilyResponse:
+        # Called once per request sent, including retries and hedges
+        if report is not None:
+            report.record_search_call()
+        if verbose():
+            logfire.debug("querying tavily: {query}", query=query)
+        return await cast(
+            Awaitable[TavilyResponse], client.search(query, **SEARCH_PARAMS)
         )
 
-        # Format output
-        formatted_text = "Sources:\n\n"
-        for source in unique_sources.values():
-            formatted_text += f"Source {source['title']}:\n===\n"
-            formatted_text += f"URL: {source['url']}\n===\n"
-            formatted_text += (
-                f"Most relevant content from source: {source['content']}\n===\n"
+    response = await call_with_retry(
+        attempt,
+        name="search",
+        retryable=is_retryable_search_error,
+        retries=deps.search_retries,
+        timeout=deps.search_timeout,
+        latency=deps.search_latency,
+        hedge_percentile=deps.search_hedge_percentile,
+        limiter=deps.search_limiter,
+    )
+    search_requests.inc(source="tavily")
+    if cache is not None:
+        await cache.set(key, json.dumps(response).encode())
+    if report is not None:
+        report.record_search(source_bytes(response), cached=False)
+    return response
+
+
+def iter_unique_sources(
+    search_response: TavilyResponse | Iterable[TavilyResponse],
+) -> Iterator[TavilyResult]:
+    """Yield search results with duplicate URLs removed, in encounter order."""
+    # A TypedDict is a plain dict at runtime, so isinstance() can't narrow it
+    responses: Iterable[TavilyResponse] = (
+        [cast(TavilyResponse, search_response)]
+        if isinstance(search_response, dict)
+        else search_response
+    )
+    seen: set[str] = set()
+    initial = 0
+
+    for response in responses:
+        for source in response["results"]:
+            initial += 1
+            if source["url"] in seen:
+                continue
+            seen.add(source["url"])
+            yield source
+
+    logfire.info(
+        "deduplicated {initial} sources to {final} unique sources",
+        initial=initial,
+        final=len(seen),
+    )
+
+
+def _iter_source_chunks(
+    source: TavilyResult,
+    raw_content: str | None = None,
+    truncated: bool = False,
+    raw_content_tokens: int | None = None,
+) -> Iterator[str]:
+    """Yield the formatted chunks for a single source.
+
+    The raw content section is only emitted when `raw_content_tokens` is set.
+    """
+    yield f"Source {source['title']}:\n===\n"
+    yield f"URL: {source['url']}\n===\n"
+    yield "Most relevant content from source: "
+    yield source["content"]
+    yield "\n===\n"
+    if raw_content_tokens is not None:
+        yield f"Full source content limited to {raw_content_tokens} tokens: "
+        if raw_content is not None:
+            yield raw_content
+        if truncated:
+            yield "... [truncated]"
+        yield "\n\n"
+
+
+def _iter_packed_sources(
+    sources: list[TavilyResult],
+    token_budget: int,
+    include_raw_content: bool,
+) -> Iterator[str]:
+    """Yield sources packed into a global token budget.
+
+    Sources are admitted in order of relevance score until their fixed
+    sections (title, URL and snippet) exhaust the budget. Whatever remains is
+    split across their raw content in proportion to score.
+    """
+    scores = [max(source.get("score", 0.0), MIN_SOURCE_WEIGHT) for source in sources]
+    overhead = RAW_CONTENT_OVERHEAD_TOKENS if include_raw_content else 0
+
+    used = count_tokens("Sources:\n\n")
+    kept: list[int] = []
+    for i in sorted(range(len(sources)), key=lambda i: scores[i], reverse=True):
+        cost = count_tokens("".join(_iter_source_chunks(sources[i]))) + overhead
+        if used + cost <= token_budget:
+            kept.append(i)
+            used += cost
+    kept.sort()
+
+    allocations = [0] * len(kept)
+    if include_raw_content:
+        remaining = token_budget - used
+        demands = [
+            count_tokens(
+                (sources[i].get("raw_content") or "")[: remaining * CHARS_PER_TOKEN * 2]
             )
-            if include_raw_content:
-                raw_content = source.get("raw_content")
-                if raw_content is None:
-                    raw_content = ""
-                elif len(raw_content) > max_tokens * 4:
-                    raw_content = raw_content[: max_tokens * 4] + "... [truncated]"
-                formatted_text += f"Full source content limited to {max_tokens} tokens: {raw_content}\n\n"
+            for i in kept
+        ]
+        allocations = allocate_budget(demands, [scores[i] for i in kept], remaining)
+
+    logfire.info(
+        "packed {kept} of {total} sources into {budget} tokens",
+        kept=len(kept),
+        total=len(sources),
+        budget=token_budget,
+    )
+
+    for i, allocation in zip(kept, allocations):
+        source = sources[i]
+        if not include_raw_content:
+            yield from _iter_source_chunks(source)
+            continue
+        raw_content = source.get("raw_content")
+        truncated = False
+        if raw_content is not None:
+            raw_content, truncated = truncate_tokens(raw_content, allocation)
+        yield from _iter_source_chunks(source, raw_content, truncated, allocation)
+
 
-        return formatted_text.strip()
+def iter_formatted_sources(
+    search_response: TavilyResponse | Iterable[TavilyResponse],
+    max_tokens: int = 1000,
+    include_raw_content: bool = True,
+    token_budget: int | None = None,
+) -> Iterator[str]:
+    """Deduplicate search results by URL and yield the formatted prompt in chunks.
+
+    Without a `token_budget`, sources are formatted as they are encountered and
+    each `raw_content` is cut to roughly `max_tokens` tokens independently,
+    passing large payloads through without intermediate copies. With a
+    `token_budget`, the whole output is packed to fit within it, allocating
+    raw content by relevance score.
+    """
+    sources = iter_unique_sources(search_response)
+
+    yield "Sources:\n\n"
+    if token_budget is not None:
+        yield from _iter_packed_sources(
+            list(sources), token_budget, include_raw_content
+        )
+        return
+
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    for source in sources:
+        if not include_raw_content:
+            yield from _iter_source_chunks(source)
+            continue
+        raw_content = source.get("raw_content")
+        truncated = raw_content is not None and len(raw_content) > max_chars
+        if raw_content is not None and truncated:
+            raw_content = raw_content[:max_chars]
+        yield from _iter_source_chunks(source, raw_content, truncated, max_tokens)
+
+
+def deduplicate_and_format_sources(
+    search_response: TavilyResponse | list[TavilyResponse],
+    max_tokens: int = 1000,
+    include_raw_content: bool = True,
+    token_budget: int | None = None,
+) -> str:
+    """Format and deduplicate search results from Tavily.
+
+    Args:
+        search_response: One or more Tavily responses.
+        max_tokens: Per-source raw content limit, used without a `token_budget`.
+        include_raw_content: Whether to include the full page content.
+        token_budget: Total token budget for the formatted output.
+    """
+    num_responses = len(search_response) if isinstance(search_response, list) else 1
+    with (
+        logfire.span("deduplicating_sources", num_responses=num_responses)
+        if verbose()
+        else contextlib.nullcontext()
+    ):
+        buffer = io.StringIO()
+        for chunk in iter_formatted_sources(
+            search_response, max_tokens, include_raw_content, token_budget
+        ):
+            buffer.write(chunk)
+        return buffer.getvalue().rstrip()
 
 
 @dataclass
-class GenerateQueries(BaseNode[PersonState, None, PersonInfo]):
+class GenerateQueries(BaseNode[PersonState, ResearchDeps, PersonInfo]):
     """Node to generate search queries for person information."""
 
-    async def run(self, ctx: GraphRunContext[PersonState]) -> Research:
+    async def run(self, ctx: GraphRunContext[PersonState, ResearchDeps]) -> Research:
         with logfire.span("generating_queries", person=ctx.state.person_str):
-            result = await query_agent.run(
-                ctx.state.person_str,
-            )
-            ctx.state.search_queries = result.data.queries
-            logfire.info("generated {num} search queries", num=len(result.data.queries))
+            prompt = ctx.state.person_str
+            if ctx.state.missing_fields:
+                # Steer later cycles away from repeating the first cycle's queries
+                prompt += "\nStill missing, focus the queries on finding: " + ", ".join(
+                    ctx.state.missing_fields
+                )
+            queries = await run_agent(query_agent, prompt, ctx.deps, ctx.state.report)
+            ctx.state.search_queries = queries.queries
+            logfire.info("generated {num} search queries", num=len(queries.queries))
             return Research()
 
 
 @dataclass
-class Research(BaseNode[PersonState, None, PersonInfo]):
+class Research(BaseNode[PersonState, ResearchDeps, PersonInfo]):
     """Node to execute web searches and process results."""
 
-    async def run(self, ctx: GraphRunContext[PersonState]) -> Extract:
+    async def run(
+        self, ctx: GraphRunContext[PersonState, ResearchDeps]
+    ) -> Extract | Reflect:
         """Execute web searches and process results."""
         with logfire.span("research_phase", num_queries=len(ctx.state.search_queries)):
             # Execute web searches using Tavily
-            search_futures: list[Awaitable[TavilyResponse]] = []
-            for query in ctx.state.search_queries:
-                logfire.debug("querying tavily: {query}", query=query)
-                search_futures.append(
-                    cast(
-                        Awaitable[TavilyResponse],
-                        tavily_client.search(
-                            query,
-                            search_depth="basic",
-                            days=360,
-                            max_results=3,
-                            include_raw_content=True,
-                            topic="general",
-                        ),
-                    )
+            queries = list(ctx.state.search_queries)
+            search_futures: list[Awaitable[TavilyResponse]] = [
+                search(query, ctx.deps, ctx.state.report) for query in queries
+            ]
+
+            # Execute searches concurrently, carrying on without failed ones.
+            # Once info has been extracted, failures never abort the run: with
+            # no new sources it goes straight to reflection on what it has
+            results = await asyncio.gather(*search_futures, return_exceptions=True)
+            search_results = self._collect_results(
+                queries,
+                results,
+                ctx.state,
+                ctx.deps.min_search_success if ctx.state.info is None else 0.0,
+            )
+
+            # Only summarize sources not seen in earlier reflection cycles
+            new_sources = self._filter_new_sources(search_results, ctx.state)
+            if not new_sources and ctx.state.info is not None:
+                logfire.info("no new sources found, skipping note taking")
+                return Reflect()
+            search_results = [TavilyResponse(results=new_sources)]
+
+            if ctx.deps.notes_group_size is None:
+                notes = await self._take_notes(
+                    search_results,
+                    ctx.deps.source_token_budget,
+                    ctx.deps,
+                    ctx.state.report,
                 )
+            else:
+                notes = await self._map_reduce_notes(
+                    search_results,
+                    ctx.deps.notes_group_size,
+                    ctx.deps,
+                    ctx.state.report,
+                )
+            ctx.state.notes.append(notes)
+            logfire.info(
+                "added {length} characters of research notes",
+                length=len(notes),
+            )
+            return Extract()
 
-            # Execute searches concurrently
-            search_results: list[TavilyResponse] = await asyncio.gather(*search_futures)
+    def _collect_results(
+        self,
+        queries: list[str],
+        results: list[TavilyResponse | BaseException],
+        state: PersonState,
+        min_success: float,
+    ) -> list[TavilyResponse]:
+        """Return the successful searches, recording failed ones in the state.
+
+        Raises:
+            ExceptionGroup: If fewer than `min_success` of the searches succeeded.
+        """
+        succeeded: list[TavilyResponse] = []
+        errors: list[Exception] = []
+        for query, result in zip(queries, results, strict=True):
+            if not isinstance(result, BaseException):
+                succeeded.append(result)
+                continue
+            if not isinstance(result, Exception):
+                raise result
+            errors.append(result)
+            search_errors.inc()
+            state.failed_searches.append(
+                SearchFailure(
+                    query=query, error=repr(result), cycle=state.reflection_count
+                )
+            )
+            logfire.warn(
+                "search failed for {query}: {error!r}", query=query, error=result
+            )
 
-            # Format and deduplicate sources
-            source_str = deduplicate_and_format_sources(
-                search_results, max_tokens=1000, include_raw_content=True
+        if errors and len(succeeded) < math.ceil(min_success * len(results)):
+            raise ExceptionGroup(
+                f"only {len(succeeded)} of {len(results)} searches succeeded", errors
             )
+        return succeeded
+
+    def _filter_new_sources(
+        self, search_results: list[TavilyResponse], state: PersonState
+    ) -> list[TavilyResult]:
+        """Return unique sources not yet seen in this run and mark them as seen.
+
+        Sources are matched by URL and by a hash of their content, so mirrors of
+        the same page under different URLs are also skipped.
+        """
+        new_sources: list[TavilyResult] = []
+        skipped = 0
+        for source in iter_unique_sources(search_results):
+            content = source.get("raw_content") or source["content"]
+            content_hash = hashlib.sha256(content.encode()).hexdigest()
+            if (
+                source["url"] in state.seen_sources
+                or content_hash in state.seen_sources
+            ):
+                skipped += 1
+                continue
+            state.seen_sources.update((source["url"], content_hash))
+            new_sources.append(source)
+
+        logfire.info(
+            "{new} new sources, {skipped} already seen in earlier cycles",
+            new=len(new_sources),
+            skipped=skipped,
+        )
+        return new_sources
+
+    async def _take_notes(
+        self,
+        search_results: list[TavilyResponse],
+        token_budget: int | None,
+        deps: ResearchDeps,
+        report: RunReport,
+    ) -> str:
+        """Summarize sources into research notes with a single agent call."""
+        # Format and deduplicate sources
+        source_str = deduplicate_and_format_sources(
+            search_results,
+            max_tokens=1000,
+            include_raw_content=True,
+            token_budget=token_budget,
+        )
 
+        if verbose():
             logfire.debug("processing search results with research agent")
-            result = await research_notes_agent.run(
-                source_str,
-            )
-            ctx.state.notes.append(str(result.data))
-            logfire.info(
-                "added {length} characters of research notes",
-                length=len(str(result.data)),
+        return await run_agent(research_notes_agent, source_str, deps, report)
+
+    async def _map_reduce_notes(
+        self,
+        search_results: list[TavilyResponse],
+        group_size: int,
+        deps: ResearchDeps,
+        report: RunReport,
+    ) -> str:
+        """Summarize groups of sources concurrently and merge their notes.
+
+        The token budget is split across groups by their share of sources, so
+        total prompt size matches the single-call mode while latency is bounded
+        by the slowest group.
+        """
+        sources = list(iter_unique_sources(search_results))
+        groups = [
+            sources[i : i + group_size] for i in range(0, len(sources), group_size)
+        ]
+
+        with logfire.span("map_reduce_notes", num_groups=len(groups)):
+            group_notes = await asyncio.gather(
+                *(
+                    self._take_notes(
+                        [{"results": group}],
+                        deps.source_token_budget * len(group) // len(sources)
+                        if deps.source_token_budget is not None
+                        else None,
+                        deps,
+                        report,
+                    )
+                    for group in groups
+                )
             )
-            return Extract()
+            return "\n\n".join(group_notes)
 
 
 @dataclass
-class Extract(BaseNode[PersonState, None, PersonInfo]):
+class Extract(BaseNode[PersonState, ResearchDeps, PersonInfo]):
     """Node to extract person information from research notes."""
 
-    async def run(self, ctx: GraphRunContext[PersonState]) -> Reflect:
+    async def run(self, ctx: GraphRunContext[PersonState, ResearchDeps]) -> Reflect:
         with logfire.span("extracting_information"):
+            previous = ctx.state.info
+            if ctx.deps.incremental_extraction and previous is not None:
+                # Only feed the newest notes alongside what we already know
+                update = await run_agent(
+                    incremental_extraction_agent,
+                    json.dumps(
+                        {
+                            "previous_info": previous.model_dump_json(),
+                            "notes": ctx.state.notes[-1],
+                        },
+                        indent=2,
+                    ),
+                    ctx.deps,
+                    ctx.state.report,
+                )
+                ctx.state.info = merge_person_info(previous, update)
+                logfire.info(
+                    "updated person information", **payload(info=ctx.state.info)
+                )
+                return Reflect()
+
             # Format all notes
             all_notes = "\n\n".join(ctx.state.notes)
-            logfire.debug(
-                "processing {length} characters of notes", length=len(all_notes)
-            )
+            if verbose():
+                logfire.debug(
+                    "processing {length} characters of notes", length=len(all_notes)
+                )
 
-            result = await extraction_agent.run(
+            info = await run_agent(
+                extraction_agent,
                 all_notes,
+                ctx.deps,
+                ctx.state.report,
             )
-            ctx.state.info = result.data
-            logfire.info("extracted person information", info=result.data)
+            ctx.state.info = info
+            logfire.info("extracted person information", **payload(info=info))
             return Reflect()
 
 
 @dataclass
-class Reflect(BaseNode[PersonState, None, PersonInfo]):
+class Reflect(BaseNode[PersonState, ResearchDeps, PersonInfo]):
     """Node to reflect on the completeness of gathered information."""
 
     def _create_default_info(self) -> PersonInfo:
@@ -237,10 +667,28 @@ class Reflect(BaseNode[PersonState, None, PersonInfo]):
         )
 
     async def run(
-        self, ctx: GraphRunContext[PersonState]
-    ) -> End[PersonInfo] | GenerateQueries:
+        self, ctx: GraphRunContext[PersonState, ResearchDeps]
+    ) -> End[PersonInfo] | GenerateQueries | Research:
         with logfire.span("reflection_phase", cycle=ctx.state.reflection_count):
-            result = await reflection_agent.run(
+            # Settle clear-cut cases without a model round-trip
+            if ctx.deps.completeness is not None:
+                verdict = ctx.deps.completeness.assess(ctx.state.info)
+                missing = ctx.deps.completeness.missing_fields(ctx.state.info)
+                if verdict != "uncertain":
+                    logfire.info(
+                        "skipping reflection agent, info is {verdict}",
+                        verdict=verdict,
+                        missing=missing,
+                    )
+                if verdict == "complete":
+                    return End(self._final_info(ctx.state))
+                if verdict == "incomplete":
+                    # Without reflection queries, new ones are generated
+                    # targeting the missing fields
+                    return self._next_cycle(ctx, [], missing)
+
+            reflection = await run_agent(
+                reflection_agent,
                 json.dumps(
                     {
                         "notes": "\n".join(ctx.state.notes),
@@ -250,30 +698,46 @@ class Reflect(BaseNode[PersonState, None, PersonInfo]):
                     },
                     indent=2,
                 ),
+                ctx.deps,
+                ctx.state.report,
             )
 
             logfire.info(
                 "reflection result: {is_satisfactory}",
-                is_satisfactory=result.data.is_satisfactory,
+                is_satisfactory=reflection.is_satisfactory,
             )
 
-            if result.data.is_satisfactory:
-                return End(
-                    ctx.state.info if ctx.state.info else self._create_default_info()
-                )
+            if reflection.is_satisfactory:
+                return End(self._final_info(ctx.state))
+            return self._next_cycle(
+                ctx, reflection.search_queries, reflection.missing_fields
+            )
 
-            # Allow up to 2 reflection cycles
-            if ctx.state.reflection_count < 2:
-                ctx.state.reflection_count += 1
-                ctx.state.search_queries = result.data.search_queries
-                logfire.info(
-                    "starting reflection cycle {cycle} with {num} new queries",
-                    cycle=ctx.state.reflection_count,
-                    num=len(result.data.search_queries),
-                )
-                return GenerateQueries()
-            else:
-                logfire.info("max reflection cycles reached, ending with current info")
-                return End(
-                    ctx.state.info if ctx.state.info else self._create_default_info()
-                )
+    def _final_info(self, state: PersonState) -> PersonInfo:
+        return state.info if state.info else self._create_default_info()
+
+    def _next_cycle(
+        self,
+        ctx: GraphRunContext[PersonState, ResearchDeps],
+        search_queries: list[str],
+        missing_fields: list[str],
+    ) -> End[PersonInfo] | GenerateQueries | Research:
+        """Start another research cycle, or end once the cycle limit is reached."""
+        # Allow up to 2 reflection cycles
+        if ctx.state.reflection_count < 2:
+            ctx.state.reflection_count += 1
+            ctx.state.search_queries = search_queries
+            ctx.state.missing_fields = missing_fields
+            logfire.info(
+                "starting reflection cycle {cycle} with {num} new queries",
+                cycle=ctx.state.reflection_count,
+                num=len(search_queries),
+            )
+            # Search with the reflection's queries directly when allowed,
+            # saving a query generation round-trip
+            if ctx.deps.reflection_queries == "reuse" and search_queries:
+                return Research()
+            return GenerateQueries()
+        else:
+            logfire.info("max reflection cycles reached, ending with current info")
+            return End(self._final_info(ctx.state))
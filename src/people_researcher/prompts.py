@@ -11,6 +11,25 @@ Here are all the notes from research:
 </web_research_notes>
 """
 
+INCREMENTAL_EXTRACTION_PROMPT = """Your task is to update previously extracted information about a person using new notes gathered from web research.
+
+You will be given the previously extracted information and only the newest research notes:
+
+<previous_info>
+{previous_info}
+</previous_info>
+
+<new_web_research_notes>
+{notes}
+</new_web_research_notes>
+
+Return the complete, updated information in the schema. When updating:
+1. Keep previously extracted facts unless the new notes clearly correct them
+2. Fill in fields that were missing or marked "Unknown" using the new notes
+3. Add any prior companies mentioned in the new notes that aren't already listed
+4. Do not drop information just because the new notes don't mention it
+"""
+
 QUERY_WRITER_PROMPT = """You are a search query generator tasked with creating targeted search queries to gather specific information about a person.
 
 Here is the person you are researching: {person}
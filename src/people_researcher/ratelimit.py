@@ -0,0 +1,269 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import re
+import time
+from collections.abc import Mapping
+from typing import TYPE_CHECKING
+
+import logfire
+
+if TYPE_CHECKING:
+    import httpx
+
+# Backoff after a 429 without a usable Retry-After header, doubled per 429
+MIN_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# A 429 multiplies the request rate by this factor, down to a floor of
+# MIN_RATE_FRACTION of the configured rate; each success then recovers
+# RECOVERY_FRACTION of the configured rate
+BACKOFF_FACTOR = 0.5
+MIN_RATE_FRACTION = 0.1
+RECOVERY_FRACTION = 0.05
+
+rate_limit_wait = logfire.metric_histogram(
+    "rate_limit_wait", unit="s", description="Time spent waiting on a rate limiter"
+)
+rate_limited_responses = logfire.metric_counter(
+    "rate_limited_responses", unit="1", description="Responses rejected with 429"
+)
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def parse_duration(value: str) -> float | None:
+    """Parse a header duration such as `"2"`, `"1.5s"`, `"20ms"` or `"6m0s"`.
+
+    Returns:
+        The duration in seconds, or `None` if it can't be parsed.
+    """
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(amount) * _DURATION_UNITS[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate` tokens per second."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._level = capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._level = min(self.capacity, self._level + elapsed * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Return the seconds until `amount` tokens are available.
+
+        Amounts above the capacity only wait for a full bucket, so oversized
+        requests still go through and are paid off by the requests after them.
+        """
+        self._refill()
+        deficit = min(amount, self.capacity) - self._level
+        return max(0.0, deficit / self.rate)
+
+    def take(self, amount: float) -> None:
+        """Remove `amount` tokens, going into debt if there aren't enough."""
+        self._refill()
+        self._level -= amount
+
+
+class SharedPause:
+    """Pause deadline shared by one provider's rate limiters across processes.
+
+    Create it in the parent process and pass it to worker processes when they
+    are started; shared memory can't be sent to a process that's already
+    running.
+    """
+
+    def __init__(self):
+        # Wall clock deadline, as monotonic clocks aren't comparable across
+        # processes on every platform
+        self._deadline = multiprocessing.get_context("spawn").Value("d", 0.0)
+
+    def remaining(self) -> float:
+        """Return the seconds left until the pause ends, or less than 0."""
+        return self._deadline.value - time.time()
+
+    def extend(self, delay: float) -> None:
+        """Pause every sharing limiter for at least `delay` seconds from now."""
+        with self._deadline.get_lock():
+            self._deadline.value = max(self._deadline.value, time.time() + delay)
+
+
+class RateLimiter:
+    """Async rate limiter shared by every call to one provider.
+
+    Requests are admitted in FIFO order within a requests-per-second budget
+    and, optionally, a tokens-per-minute budget. The limiter also adapts to
+    the provider's responses (see `observe()`): a 429 pauses every caller for
+    the Retry-After period, or an exponential backoff without one, and cuts
+    the request rate, which then recovers gradually as requests succeed.
+    Exhausted `x-ratelimit-remaining-*` headers pause callers until the
+    matching `x-ratelimit-reset-*`.
+
+    Responses are observed through `observe_response()`, which `PooledClients`
+    installs as an httpx event hook.
+
+    Worker processes sharing one budget each use a limiter from
+    `for_worker()`.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_second: float,
+        tokens_per_minute: float | None = None,
+        burst: float | None = None,
+        shared_pause: SharedPause | None = None,
+    ):
+        """Create a rate limiter.
+
+        Args:
+            name: Provider name, used in logs and metrics.
+            requests_per_second: Sustained request rate to stay under.
+            tokens_per_minute: Sustained token rate to stay under, if any.
+            burst: Requests that may be sent at once after an idle period,
+                defaults to one second's worth.
+            shared_pause: Pause shared with limiters in other processes, so a
+                429 seen by any of them pauses all of them.
+        """
+        self.name = name
+        self.requests_per_second = requests_per_second
+        self.tokens_per_minute = tokens_per_minute
+        self.burst = burst or max(1.0, requests_per_second)
+        self.shared_pause = shared_pause
+        self._requests = TokenBucket(requests_per_second, self.burst)
+        self._tokens = (
+            TokenBucket(tokens_per_minute / 60, tokens_per_minute)
+            if tokens_per_minute
+            else None
+        )
+        self._lock = asyncio.Lock()
+        self._paused_until = 0.0
+        self._backoff = MIN_BACKOFF
+
+    @property
+    def current_rate(self) -> float:
+        """The request rate currently enforced, after adaptive backoff."""
+        return self._requests.rate
+
+    def for_worker(
+        self, workers: int, shared_pause: SharedPause | None = None
+    ) -> RateLimiter:
+        """Return a limiter for one of `workers` processes sharing this budget.
+
+        Each worker gets an equal share of the request and token rates, so
+        together they stay under the budget without talking to each other on
+        every request. Pauses are coordinated through `shared_pause`.
+        """
+        return RateLimiter(
+            self.name,
+            self.requests_per_second / workers,
+            tokens_per_minute=self.tokens_per_minute / workers
+            if self.tokens_per_minute
+            else None,
+            burst=max(1.0, self.burst / workers),
+            shared_pause=shared_pause,
+        )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until one request of about `tokens` tokens fits in the budget."""
+        start = time.monotonic()
+        async with self._lock:
+            while True:
+                delay = max(
+                    self._paused_until - time.monotonic(),
+                    self.shared_pause.remaining() if self.shared_pause else 0,
+                    self._requests.wait_time(1),
+                    self._tokens.wait_time(tokens) if self._tokens and tokens else 0,
+                )
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+
+            self._requests.take(1)
+            if self._tokens is not None and tokens:
+                self._tokens.take(tokens)
+        rate_limit_wait.record(time.monotonic() - start, {"provider": self.name})
+
+    def consume(self, tokens: int = 0, requests: int = 0) -> None:
+        """Charge usage beyond what was passed to `acquire()`.
+
+        Use this once the actual usage of a call is known, e.g. response tokens
+        or retried requests, so later callers wait off the difference.
+        """
+        if requests > 0:
+            self._requests.take(requests)
+        if self._tokens is not None and tokens > 0:
+            self._tokens.take(tokens)
+
+    def observe(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt to the status code and rate limit headers of a response.
+
+        Args:
+            status_code: HTTP status of the response.
+            headers: Response headers, with lowercase names.
+        """
+        if status_code == 429:
+            retry_after = headers.get("retry-after")
+            self._on_rate_limited(parse_duration(retry_after) if retry_after else None)
+            return
+
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = headers.get(f"x-ratelimit-reset-{kind}")
+            if remaining is None or reset is None or remaining.strip() != "0":
+                continue
+            if (delay := parse_duration(reset)) is not None:
+                self._pause(delay)
+
+        if status_code < 400:
+            self._on_success()
+
+    async def observe_response(self, response: httpx.Response) -> None:
+        """Feed every response of an httpx client to `observe()` as an event hook."""
+        self.observe(response.status_code, response.headers)
+
+    def _pause(self, delay: float) -> None:
+        self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        if self.shared_pause is not None:
+            self.shared_pause.extend(delay)
+
+    def _on_rate_limited(self, retry_after: float | None) -> None:
+        delay = retry_after if retry_after is not None else self._backoff
+        self._backoff = min(MAX_BACKOFF, self._backoff * 2)
+        self._pause(delay)
+        self._requests.rate = max(
+            self.requests_per_second * MIN_RATE_FRACTION,
+            self._requests.rate * BACKOFF_FACTOR,
+        )
+        rate_limited_responses.add(1, {"provider": self.name})
+        logfire.warn(
+            "{provider} rate limited, pausing {delay:.1f}s at {rate:.2f} req/s",
+            provider=self.name,
+            delay=delay,
+            rate=self._requests.rate,
+        )
+
+    def _on_success(self) -> None:
+        self._backoff = MIN_BACKOFF
+        if self._requests.rate < self.requests_per_second:
+            self._requests.rate = min(
+                self.requests_per_second,
+                self._requests.rate + self.requests_per_second * RECOVERY_FRACTION,
+            )
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from pydantic import BaseModel, Field
+from pydantic_graph import HistoryStep, NodeStep
+
+from pydantic_ai.usage import Usage
+
+
+class AgentUsage(BaseModel):
+    """Model usage of one agent over a run."""
+
+    runs: int = 0
+    cache_hits: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class RunReport(BaseModel):
+    """Where the time and cost of researching one person went."""
+
+    # Wall time spent running the graph, and per node across its visits
+    total_seconds: float = 0.0
+    node_seconds: dict[str, float] = Field(default_factory=dict)
+    node_visits: dict[str, int] = Field(default_factory=dict)
+
+    agents: dict[str, AgentUsage] = Field(default_factory=dict)
+
+    # Requests sent to Tavily, counting every retry, hedged duplicate and
+    # failed attempt as they're all billed, searches served from the cache,
+    # and the bytes of source content returned
+    search_calls: int = 0
+    search_cache_hits: int = 0
+    source_bytes: int = 0
+
+    reflection_cycles: int = 0
+
+    @property
+    def input_tokens(self) -> int:
+        return sum(usage.input_tokens for usage in self.agents.values())
+
+    @property
+    def output_tokens(self) -> int:
+        return sum(usage.output_tokens for usage in self.agents.values())
+
+    def record_agent(self, agent: str, usage: Usage) -> None:
+        """Add one agent run, with no requests if it was served from the cache."""
+        totals = self.agents.setdefault(agent, AgentUsage())
+        totals.runs += 1
+        if usage.requests == 0:
+            totals.cache_hits += 1
+        totals.requests += usage.requests
+        totals.input_tokens += usage.request_tokens or 0
+        totals.output_tokens += usage.response_tokens or 0
+
+    def record_search_call(self) -> None:
+        """Add one request sent to Tavily, whether or not it succeeds."""
+        self.search_calls += 1
+
+    def record_search(self, source_bytes: int, cached: bool) -> None:
+        """Add the source content of one completed search."""
+        if cached:
+            self.search_cache_hits += 1
+        self.source_bytes += source_bytes
+
+    def record_history(self, history: Iterable[HistoryStep[Any, Any]]) -> None:
+        """Add the node timings from a graph run's history."""
+        for step in history:
+            if isinstance(step, NodeStep) and step.duration is not None:
+                node_id = step.node.get_id()
+                self.node_seconds[node_id] = (
+                    self.node_seconds.get(node_id, 0.0) + step.duration
+                )
+                self.node_visits[node_id] = self.node_visits.get(node_id, 0) + 1
@@ -0,0 +1,337 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable, Sequence
+from types import TracebackType
+from typing import TypeVar
+
+import logfire
+from pydantic_graph import BaseNode, End, Graph, HistoryStep, NodeStep
+
+from .clients import PooledClients
+from .deps import ResearchDeps
+from .graph import research_graph
+from .metrics import (
+    node_seconds,
+    research_in_flight,
+    research_runs,
+    research_seconds,
+)
+from .nodes import GenerateQueries
+from .report import RunReport
+from .snapshots import SnapshotStore
+from .state import PersonInfo, PersonState, UserNotes
+from .telemetry import configure_telemetry, payload
+from .tokens import load_encoding
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def bounded_map(
+    fn: Callable[[T], Awaitable[R]],
+    items: Iterable[T],
+    max_concurrency: int,
+) -> AsyncIterator[tuple[T, R | Exception]]:
+    """Apply `fn` to `items` concurrently, yielding results as they complete.
+
+    Items are pulled lazily, so at most `max_concurrency` calls are in flight
+    and arbitrarily large iterables are never fully materialized. A call that
+    raises yields its exception in place of a result, so one failure never
+    cancels the calls still in flight.
+
+    Yields:
+        `(item, result)` pairs in completion order, not input order.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    pending: dict[asyncio.Task[R], T] = {}
+    items_iter = iter(items)
+    exhausted = False
+
+    try:
+        while True:
+            # Top up the in-flight set from the input iterator
+            while not exhausted and len(pending) < max_concurrency:
+                try:
+                    item = next(items_iter)
+                except StopIteration:
+                    exhausted = True
+                    break
+                pending[asyncio.ensure_future(fn(item))] = item
+
+            if not pending:
+                return
+
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                error = task.exception()
+                if error is not None and not isinstance(error, Exception):
+                    raise error
+                yield item, error if error is not None else task.result()
+    finally:
+        # Don't leave orphaned tasks behind on error or early exit
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def _record_steps(
+    state: PersonState, steps: Sequence[HistoryStep[PersonState, PersonInfo]]
+) -> None:
+    """Account node timings in the run report and the node latency metric."""
+    state.report.record_history(steps)
+    for step in steps:
+        if isinstance(step, NodeStep) and step.duration is not None:
+            node_seconds.observe(step.duration, node=step.node.get_id())
+
+
+class Researcher:
+    """Runs person research with a shared graph, deps and clients.
+
+    A researcher is meant to be long-lived: create one per process or service
+    so that every request reuses the same graph, connection pools and caches,
+    leaving only state allocation on the per-request path.
+    """
+
+    def __init__(
+        self,
+        deps: ResearchDeps | None = None,
+        *,
+        graph: Graph[PersonState, ResearchDeps, PersonInfo] = research_graph,
+        clients: PooledClients | None = None,
+        snapshot_store: SnapshotStore | None = None,
+    ):
+        """Create a researcher.
+
+        Args:
+            deps: Dependencies shared by every graph run.
+            graph: The research graph to run.
+            clients: Pooled clients owned by this researcher, closed by `aclose()`.
+            snapshot_store: Store that runs with a `run_id` are checkpointed to
+                after every node and resumed from.
+        """
+        self.deps = deps or ResearchDeps()
+        self.graph = graph
+        self.snapshot_store = snapshot_store
+        self._clients = clients
+
+    @classmethod
+    def pooled(
+        cls,
+        deps: ResearchDeps | None = None,
+        max_connections: int = 100,
+        snapshot_store: SnapshotStore | None = None,
+        max_keepalive_connections: int = 20,
+    ) -> Researcher:
+        """Create a researcher that owns pooled Tavily and OpenAI clients.
+
+        The clients report responses to the rate limiters in `deps`, if any.
+        A search client or model already set in `deps` is kept, and the pooled
+        client only fills in the one left unset.
+
+        Args:
+            deps: Dependencies shared by every graph run.
+            max_connections: Maximum open HTTP connections to each provider.
+            snapshot_store: Store to checkpoint runs with a `run_id` to.
+            max_keepalive_connections: Maximum idle connections kept open to
+                each provider for reuse.
+        """
+        deps = deps or ResearchDeps()
+        clients = PooledClients(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            search_limiter=deps.search_limiter,
+            llm_limiter=deps.llm_limiter,
+        )
+        deps = dataclasses.replace(
+            deps,
+            search_client=deps.search_client or clients.search_client,
+            model=deps.model or clients.model,
+        )
+        return cls(deps, clients=clients, snapshot_store=snapshot_store)
+
+    async def research(
+        self, state: PersonState, run_id: str | None = None
+    ) -> PersonInfo:
+        """Run the research graph to completion for a single initialized state.
+
+        Latency and cost of the run are accounted in `state.report`.
+
+        Args:
+            state: Initial state of the person to research.
+            run_id: Stable ID of this run. With a snapshot store, the state is
+                checkpointed under this ID after every node, and a run that was
+                interrupted resumes from its last completed node instead of
+                starting over, restoring the snapshot into `state`.
+        """
+        configure_telemetry()
+        # Token counts are taken on the event loop, so load the tokenizer
+        # off it before they're needed
+        await load_encoding()
+        with logfire.span("research_person", email=state.email, name=state.name):
+            logfire.info("initialized research for {email}", email=state.email)
+
+            start = time.perf_counter()
+            research_in_flight.inc()
+            try:
+                if self.snapshot_store is None or run_id is None:
+                    result, history = await self.graph.run(
+                        GenerateQueries(),
+                        state=state,
+                        deps=self.deps,
+                        infer_name=False,
+                    )
+                    _record_steps(state, history)
+                else:
+                    result = await self._run_with_snapshots(
+                        state, self.snapshot_store, run_id
+                    )
+            except Exception:
+                research_runs.inc(outcome="error")
+                logfire.exception("research failed for {email}", email=state.email)
+                raise
+            finally:
+                research_in_flight.dec()
+
+            elapsed = time.perf_counter() - start
+            research_runs.inc(outcome="success")
+            research_seconds.observe(elapsed)
+            state.report.total_seconds += elapsed
+            state.report.reflection_cycles = state.reflection_count
+
+            logfire.info(
+                "completed research for {email}",
+                email=state.email,
+                **payload(result=result),
+            )
+            return result
+
+    async def _run_with_snapshots(
+        self, state: PersonState, store: SnapshotStore, run_id: str
+    ) -> PersonInfo:
+        node: BaseNode[PersonState, ResearchDeps, PersonInfo] = GenerateQueries()
+        if snapshot := await store.load(run_id):
+            restored, node_id = snapshot
+            for f in dataclasses.fields(state):
+                setattr(state, f.name, getattr(restored, f.name))
+            node = self.graph.node_defs[node_id].node()
+            logfire.info("resuming {run_id} at {node}", run_id=run_id, node=node_id)
+
+        # Step through the graph so the state can be saved between nodes
+        history: list[HistoryStep[PersonState, PersonInfo]] = []
+        while True:
+            next_node = await self.graph.next(
+                node, history, state=state, deps=self.deps, infer_name=False
+            )
+            _record_steps(state, history[-1:])
+            if isinstance(next_node, End):
+                await store.delete(run_id)
+                return next_node.data
+            node = next_node
+            await store.save(run_id, state, node.get_id())
+
+    async def research_many(
+        self,
+        people: Iterable[PersonState],
+        max_concurrency: int = 10,
+    ) -> AsyncIterator[tuple[PersonState, PersonInfo | Exception]]:
+        """Research many people concurrently on the current event loop.
+
+        Inputs are pulled lazily from `people`, so at most `max_concurrency`
+        graph runs are in flight at any time and arbitrarily large iterables
+        are never fully materialized. A run that fails is logged and yields
+        its exception in place of the info, so one bad row never aborts the
+        runs still in flight.
+
+        Args:
+            people: Initial states for each person to research.
+            max_concurrency: Maximum number of graph runs in flight at once.
+
+        Yields:
+            `(state, info)` pairs, or `(state, exception)` for failed runs, in
+            completion order, not input order.
+        """
+        configure_telemetry()
+        with logfire.span("research_people", max_concurrency=max_concurrency):
+            async for result in bounded_map(self.research, people, max_concurrency):
+                yield result
+
+    async def aclose(self) -> None:
+        """Close any clients owned by this researcher."""
+        if self._clients is not None:
+            await self._clients.aclose()
+
+    async def __aenter__(self) -> Researcher:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+
+async def research_person(
+    email: str,
+    name: str | None = None,
+    company: str | None = None,
+    linkedin: str | None = None,
+    role: str | None = None,
+    user_notes: UserNotes | None = None,
+    deps: ResearchDeps | None = None,
+    report: RunReport | None = None,
+) -> PersonInfo:
+    """Research a person and return structured information about them.
+
+    Pass a `report` to get the latency and cost of the run accounted in it.
+
+    The run uses the stock, unpooled Tavily client unless `deps` sets one, so
+    each search opens a new connection. Use `Researcher.pooled()` to research
+    more than a few people.
+    """
+    # Initialize state
+    state = PersonState(
+        email=email,
+        name=name,
+        company=company,
+        linkedin=linkedin,
+        role=role,
+        user_notes=user_notes,
+    )
+    if report is not None:
+        state.report = report
+
+    return await Researcher(deps).research(state)
+
+
+async def research_people(
+    people: Iterable[PersonState],
+    max_concurrency: int = 10,
+    deps: ResearchDeps | None = None,
+) -> AsyncIterator[tuple[PersonState, PersonInfo | Exception]]:
+    """Research many people concurrently on the current event loop.
+
+    See `Researcher.research_many`; for long-running use, create a single
+    `Researcher` and call that directly. Like `research_person()`, this uses
+    unpooled clients unless `deps` sets them, so `Researcher.pooled()` is
+    usually faster.
+
+    Args:
+        people: Initial states for each person to research.
+        max_concurrency: Maximum number of graph runs in flight at once.
+        deps: Dependencies shared by every graph run.
+
+    Yields:
+        `(state, info)` pairs, or `(state, exception)` for failed runs, in
+        completion order, not input order.
+    """
+    async for result in Researcher(deps).research_many(people, max_concurrency):
+        yield result
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, TypeVar
+
+import logfire
+
+if TYPE_CHECKING:
+    from .ratelimit import RateLimiter
+
+T = TypeVar("T")
+
+# Full-jitter exponential backoff between retries, in seconds
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 10.0
+
+# Latencies needed before percentiles are trusted for hedging
+MIN_LATENCY_SAMPLES = 20
+
+call_latency = logfire.metric_histogram(
+    "call_latency", unit="s", description="Latency of successful provider calls"
+)
+call_retries = logfire.metric_counter(
+    "call_retries", unit="1", description="Provider calls retried after an error"
+)
+call_timeouts = logfire.metric_counter(
+    "call_timeouts", unit="1", description="Provider call attempts that timed out"
+)
+call_hedges = logfire.metric_counter(
+    "call_hedges", unit="1", description="Duplicate requests sent for slow calls"
+)
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies, for tail percentiles."""
+
+    def __init__(self, window: int = 500):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> float | None:
+        """Return the `p` (0-1) latency percentile, or `None` with too few samples."""
+        if len(self._samples) < MIN_LATENCY_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a full-jitter exponential backoff for the given retry attempt."""
+    return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt))
+
+
+async def _send(
+    call: Callable[[], Awaitable[T]],
+    timeout: float | None,
+    limiter: RateLimiter | None = None,
+) -> T:
+    """Send one request, timing it out only once it has its limiter slot."""
+    if limiter is not None:
+        await limiter.acquire()
+    async with asyncio.timeout(timeout):
+        return await call()
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    hedge_after: float | None,
+    name: str = "call",
+    limiter: RateLimiter | None = None,
+    timeout: float | None = None,
+) -> T:
+    """Run `call`, starting a duplicate if it hasn't finished after `hedge_after`.
+
+    The first successful result wins and the other request is cancelled. An
+    error is only raised once every request has failed. With a `limiter`, the
+    duplicate waits for its own slot first; the first request is expected to
+    have acquired one already. Each request times out after `timeout` seconds
+    from when it's sent, so waiting for a slot doesn't count against it.
+    """
+    pending: set[asyncio.Future[T]] = {asyncio.ensure_future(_send(call, timeout))}
+    if hedge_after is None:
+        return await pending.pop()
+
+    try:
+        done, _ = await asyncio.wait(pending, timeout=hedge_after)
+        if not done:
+            call_hedges.add(1, {"call": name})
+            pending.add(asyncio.ensure_future(_send(call, timeout, limiter)))
+
+        while True:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+            if not pending:
+                return done.pop().result()
+    finally:
+        for future in pending:
+            future.cancel()
+
+
+async def call_with_retry(
+    call: Callable[[], Awaitable[T]],
+    *,
+    name: str,
+    retryable: Callable[[BaseException], bool],
+    retries: int = 2,
+    timeout: float | None = None,
+    latency: LatencyTracker | None = None,
+    hedge_percentile: float | None = None,
+    limiter: RateLimiter | None = None,
+) -> T:
+    """Call a provider with per-attempt timeouts, retries and optional hedging.
+
+    Args:
+        call: Function making one request; called again for every retry and
+            hedge.
+        name: Name of the call in logs and metrics.
+        retryable: Whether an error is transient and worth retrying. Timeouts
+            are always retried.
+        retries: Maximum number of retries after the first attempt.
+        timeout: Seconds before a request is abandoned. An attempt times out
+            once its request, and its hedge if one was sent, have timed out.
+        latency: Tracker that successful latencies are recorded in.
+        hedge_percentile: Send a duplicate request once an attempt is slower
+            than this percentile (0-1) of `latency`, if set.
+        limiter: Rate limiter every request, including retries and hedges,
+            waits on. Waiting for it doesn't count against `timeout`, so a
+            long queue doesn't time out requests that were never sent.
+    """
+    attributes = {"call": name}
+    for attempt in range(retries + 1):
+        hedge_after = (
+            latency.percentile(hedge_percentile)
+            if latency is not None and hedge_percentile is not None
+            else None
+        )
+        if limiter is not None:
+            await limiter.acquire()
+        start = time.monotonic()
+        try:
+            result = await hedged(call, hedge_after, name, limiter, timeout)
+        except TimeoutError:
+            call_timeouts.add(1, attributes)
+            if attempt == retries:
+                raise
+            error = "timed out"
+        except Exception as e:
+            if attempt == retries or not retryable(e):
+                raise
+            error = repr(e)
+        else:
+            elapsed = time.monotonic() - start
+            call_latency.record(elapsed, attributes)
+            if latency is not None:
+                latency.record(elapsed)
+            return result
+
+        delay = backoff_delay(attempt)
+        call_retries.add(1, attributes)
+        logfire.warn(
+            "{call} failed ({error}), retrying in {delay:.2f}s",
+            call=name,
+            error=error,
+            delay=delay,
+        )
+        await asyncio.sleep(delay)
+
+    raise AssertionError("unreachable")
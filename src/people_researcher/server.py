@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any
+
+import logfire
+from pydantic import BaseModel, ValidationError
+
+from .metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, REGISTRY, server_queue_depth
+from .research import Researcher
+from .state import PersonInfo, PersonState, UserNotes
+from .telemetry import configure_telemetry
+
+# Largest request body accepted, in bytes
+MAX_BODY_SIZE = 1024 * 1024
+
+
+class ResearchRequest(BaseModel):
+    """Body of a research request."""
+
+    email: str | None = None
+    name: str | None = None
+    company: str | None = None
+    linkedin: str | None = None
+    role: str | None = None
+    user_notes: UserNotes | None = None
+
+    def to_state(self) -> PersonState:
+        return PersonState(
+            email=self.email,
+            name=self.name,
+            company=self.company,
+            linkedin=self.linkedin,
+            role=self.role,
+            user_notes=self.user_notes,
+        )
+
+
+@dataclass
+class _Job:
+    state: PersonState
+    result: asyncio.Future[PersonInfo] = field(
+        default_factory=lambda: asyncio.get_running_loop().create_future()
+    )
+
+
+class _HTTPError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class ResearchServer:
+    """HTTP/JSON front end that keeps a `Researcher` warm between requests.
+
+    Requests are queued and served by a fixed pool of workers. When the queue
+    is full, new requests are rejected with `503 Service Unavailable` instead
+    of piling up, so callers can back off.
+
+    Endpoints:
+        `POST /research`: research the person in the JSON body and return their
+            `PersonInfo`.
+        `GET /health`: report queue depth and in-flight requests.
+        `GET /metrics`: pipeline metrics in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        researcher: Researcher,
+        max_concurrency: int = 10,
+        max_queue: int = 100,
+    ):
+        self.researcher = researcher
+        self.max_concurrency = max_concurrency
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue(maxsize=max_queue)
+        self._in_flight = 0
+
+    async def serve(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        unix_socket: str | None = None,
+    ) -> None:
+        """Serve requests until cancelled.
+
+        Args:
+            host: Interface to listen on.
+            port: TCP port to listen on.
+            unix_socket: Path of a Unix socket to listen on instead of TCP.
+        """
+        configure_telemetry()
+        if unix_socket is not None:
+            server = await asyncio.start_unix_server(self._handle, path=unix_socket)
+            address = unix_socket
+        else:
+            server = await asyncio.start_server(self._handle, host=host, port=port)
+            address = f"http://{host}:{port}"
+
+        workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.max_concurrency)
+        ]
+        logfire.info("serving research requests on {address}", address=address)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._in_flight += 1
+            try:
+                job.result.set_result(await self.researcher.research(job.state))
+            except Exception as e:
+                if not job.result.done():
+                    job.result.set_exception(e)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                    headers = await self._read_headers(reader)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    body = await self._read_body(reader, headers)
+                    status, payload = await self._route(method, path, body)
+                except _HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                    keep_alive = False
+                except ValueError:
+                    status, payload = HTTPStatus.BAD_REQUEST, {"error": "bad request"}
+                    keep_alive = False
+                await self._respond(writer, status, payload, keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_headers(self, reader: asyncio.StreamReader) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                return headers
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+    async def _read_body(
+        self, reader: asyncio.StreamReader, headers: dict[str, str]
+    ) -> bytes:
+        length = int(headers.get("content-length", "0"))
+        if length > MAX_BODY_SIZE:
+            raise _HTTPError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "body too large")
+        return await reader.readexactly(length)
+
+    async def _route(
+        self, method: str, path: str, body: bytes
+    ) -> tuple[HTTPStatus, dict[str, Any] | str]:
+        if path == "/metrics":
+            if method != "GET":
+                raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET")
+            server_queue_depth.set(self._queue.qsize())
+            return HTTPStatus.OK, REGISTRY.render()
+
+        if path == "/health":
+            if method != "GET":
+                raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use GET")
+            return HTTPStatus.OK, {
+                "status": "ok",
+                "queued": self._queue.qsize(),
+                "in_flight": self._in_flight,
+            }
+
+        if path == "/research":
+            if method != "POST":
+                raise _HTTPError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST")
+            try:
+                request = ResearchRequest.model_validate_json(body)
+            except ValidationError as e:
+                return HTTPStatus.UNPROCESSABLE_ENTITY, {
+                    "error": "invalid request",
+                    "detail": json.loads(e.json()),
+                }
+
+            job = _Job(request.to_state())
+            try:
+                self._queue.put_nowait(job)
+            except asyncio.QueueFull:
+                return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "queue full"}
+
+            try:
+                info = await job.result
+            except Exception as e:
+                logfire.exception("research request failed")
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)}
+            return HTTPStatus.OK, info.model_dump(mode="json")
+
+        raise _HTTPError(HTTPStatus.NOT_FOUND, "not found")
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: dict[str, Any] | str,
+        keep_alive: bool,
+    ) -> None:
+        # Text payloads are metrics scrapes, everything else is JSON
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), METRICS_CONTENT_TYPE
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == HTTPStatus.SERVICE_UNAVAILABLE:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Protocol
+
+from pydantic import TypeAdapter
+
+from .state import PersonState
+
+_state_adapter = TypeAdapter(PersonState)
+
+
+class SnapshotStore(Protocol):
+    """Store of in-progress graph runs, keyed by run ID.
+
+    A snapshot is the `PersonState` after a node completes together with the ID
+    of the next node to run, which is all that's needed to resume the run.
+    """
+
+    async def load(self, run_id: str) -> tuple[PersonState, str] | None:
+        """Return the latest state and next node ID for `run_id`, if any."""
+        ...
+
+    async def save(self, run_id: str, state: PersonState, next_node: str) -> None:
+        """Record the state of `run_id` before `next_node` runs."""
+        ...
+
+    async def delete(self, run_id: str) -> None:
+        """Drop the snapshot of a finished run."""
+        ...
+
+
+class MemorySnapshotStore:
+    """In-process snapshot store, useful for retrying failed runs in place."""
+
+    def __init__(self):
+        self._snapshots: dict[str, tuple[bytes, str]] = {}
+
+    async def load(self, run_id: str) -> tuple[PersonState, str] | None:
+        snapshot = self._snapshots.get(run_id)
+        if snapshot is None:
+            return None
+        data, next_node = snapshot
+        return _state_adapter.validate_json(data), next_node
+
+    async def save(self, run_id: str, state: PersonState, next_node: str) -> None:
+        # Serialize so later mutations of the live state don't leak in
+        self._snapshots[run_id] = (_state_adapter.dump_json(state), next_node)
+
+    async def delete(self, run_id: str) -> None:
+        self._snapshots.pop(run_id, None)
+
+
+class SqliteSnapshotStore:
+    """Persistent snapshot store backed by SQLite, surviving process restarts.
+
+    Queries run in a worker thread, as every commit syncs to disk and would
+    otherwise stall every run on the event loop at each node transition.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                run_id TEXT PRIMARY KEY,
+                state BLOB NOT NULL,
+                next_node TEXT NOT NULL,
+                updated REAL NOT NULL
+            )
+            """
+        )
+        self._conn.commit()
+
+    async def load(self, run_id: str) -> tuple[PersonState, str] | None:
+        row = await asyncio.to_thread(
+            self._fetch_one,
+            "SELECT state, next_node FROM snapshots WHERE run_id = ?",
+            (run_id,),
+        )
+        if row is None:
+            return None
+        return _state_adapter.validate_json(row[0]), row[1]
+
+    async def save(self, run_id: str, state: PersonState, next_node: str) -> None:
+        # Serialize on the loop, before the state changes under the writer
+        data = _state_adapter.dump_json(state)
+        await asyncio.to_thread(
+            self._write,
+            (
+                "INSERT OR REPLACE INTO snapshots (run_id, state, next_node, updated) "
+                "VALUES (?, ?, ?, ?)",
+                (run_id, data, next_node, time.time()),
+            ),
+        )
+
+    async def delete(self, run_id: str) -> None:
+        await asyncio.to_thread(
+            self._write, ("DELETE FROM snapshots WHERE run_id = ?", (run_id,))
+        )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _fetch_one(self, sql: str, parameters: tuple[object, ...]) -> Any:
+        with self._lock:
+            return self._conn.execute(sql, parameters).fetchone()
+
+    def _write(self, *statements: tuple[str, tuple[object, ...]]) -> None:
+        """Run `statements` in one transaction."""
+        with self._lock:
+            for sql, parameters in statements:
+                self._conn.execute(sql, parameters)
+            self._conn.commit()
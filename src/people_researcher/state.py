@@ -2,6 +2,8 @@ from dataclasses import dataclass, field
 
 from pydantic import BaseModel
 
+from .report import RunReport
+
 
 class Employment(BaseModel):
     """Information about a prior company."""
@@ -22,6 +24,35 @@ class PersonInfo(BaseModel):
     notes: str
 
 
+def merge_person_info(previous: PersonInfo, update: PersonInfo) -> PersonInfo:
+    """Merge an incremental extraction into previously extracted information.
+
+    Facts already known are kept when the update leaves them blank or unknown,
+    and prior companies from both are combined.
+    """
+
+    def pick(old: str, new: str) -> str:
+        return old if not new.strip() or new.strip().lower() == "unknown" else new
+
+    companies: dict[tuple[str, str], Employment] = {
+        (job.name.lower(), job.role.lower()): job for job in previous.prior_companies
+    }
+    for job in update.prior_companies:
+        key = (job.name.lower(), job.role.lower())
+        known = companies.get(key)
+        if known is not None and job.year_ended is None:
+            job = job.model_copy(update={"year_ended": known.year_ended})
+        companies[key] = job
+
+    return PersonInfo(
+        years_experience=max(previous.years_experience, update.years_experience),
+        current_company=pick(previous.current_company, update.current_company),
+        role=pick(previous.role, update.role),
+        prior_companies=list(companies.values()),
+        notes=pick(previous.notes, update.notes),
+    )
+
+
 class UserNotes(BaseModel):
     """Optional user-provided notes."""
 
@@ -29,6 +60,14 @@ class UserNotes(BaseModel):
     context: str
 
 
+class SearchFailure(BaseModel):
+    """A search that failed after retries and was left out of the notes."""
+
+    query: str
+    error: str
+    cycle: int
+
+
 @dataclass
 class PersonState:
     """State for the person research workflow."""
@@ -47,6 +86,19 @@ class PersonState:
     user_notes: UserNotes | None = None
     reflection_count: int = 0
 
+    # PersonInfo fields still missing when the last cycle was reflected on,
+    # which later query generation targets
+    missing_fields: list[str] = field(default_factory=list[str])
+
+    # URLs and content hashes of sources already summarized in earlier cycles
+    seen_sources: set[str] = field(default_factory=set[str])
+
+    # Searches that failed and were skipped, across all cycles
+    failed_searches: list[SearchFailure] = field(default_factory=list[SearchFailure])
+
+    # Latency and cost accounting for this run
+    report: RunReport = field(default_factory=RunReport)
+
     @property
     def person_str(self) -> str:
         """Format person info for prompts."""
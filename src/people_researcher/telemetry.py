@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Literal
+
+import logfire
+
+TelemetryLevel = Literal["debug", "info"]
+
+
+@dataclass(frozen=True)
+class TelemetrySettings:
+    """How much logfire telemetry research runs emit.
+
+    At the `"debug"` level every span and event is emitted with its full
+    payload, such as the extracted `PersonInfo`. At the `"info"` level debug
+    events, per-call spans inside nodes and large payloads are dropped, so
+    nothing is serialized for them, while the research run and node spans
+    and their info events are kept.
+    """
+
+    level: TelemetryLevel = "debug"
+
+    # Fraction (0-1) of traces kept, decided once at the root of each trace
+    sample_rate: float = 1.0
+
+    def __post_init__(self) -> None:
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError(f"sample_rate must be between 0 and 1: {self.sample_rate}")
+
+
+_settings: TelemetrySettings | None = None
+
+
+def configure_telemetry(settings: TelemetrySettings | None = None) -> None:
+    """Configure logfire once, on the first call in this process.
+
+    Every research run calls this with no settings, so entry points that take
+    telemetry options must call it with them before researching.
+    """
+    global _settings
+    if _settings is not None:
+        return
+    _settings = settings or TelemetrySettings()
+    logfire.configure(
+        scrubbing=False,
+        sampling=logfire.SamplingOptions(head=_settings.sample_rate),
+    )
+
+
+def verbose() -> bool:
+    """Whether debug events and large payloads are emitted."""
+    return _settings is None or _settings.level == "debug"
+
+
+def payload(**attributes: Any) -> dict[str, Any]:
+    """Return `attributes` to attach to an event, or nothing unless verbose."""
+    return attributes if verbose() else {}
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+from typing import TYPE_CHECKING
+
+import logfire
+
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
+# Encoding used by gpt-4o
+ENCODING_NAME = "o200k_base"
+
+# Fallback ratio when the tokenizer is unavailable
+CHARS_PER_TOKEN = 4
+
+# Seconds a research run waits for the tokenizer before falling back to the
+# character heuristic; tiktoken's first download has no timeout of its own
+TOKENIZER_LOAD_TIMEOUT = 10.0
+
+_encoding: Encoding | None = None
+_loaded = threading.Event()
+_loader: threading.Thread | None = None
+_loader_lock = threading.Lock()
+_fallback_logged = False
+_wait_timed_out = False
+
+
+def _load_encoding() -> None:
+    global _encoding
+    try:
+        import tiktoken
+
+        _encoding = tiktoken.get_encoding(ENCODING_NAME)
+    except Exception as e:
+        logfire.warn(
+            "tokenizer unavailable, estimating tokens from characters: {error}",
+            error=str(e),
+        )
+    finally:
+        _loaded.set()
+
+
+def _start_loading() -> None:
+    global _loader
+    with _loader_lock:
+        if _loader is None:
+            # A daemon thread, so a download stuck on the network can't hold
+            # up the event loop or interpreter exit
+            _loader = threading.Thread(
+                target=_load_encoding, name="tokenizer-loader", daemon=True
+            )
+            _loader.start()
+
+
+def get_encoding() -> Encoding | None:
+    """Return the tokenizer, or `None` while it loads or if it can't be loaded.
+
+    Never blocks: the first call starts loading the encoding in a background
+    thread, as tiktoken downloads it on first use unless it's already in
+    `TIKTOKEN_CACHE_DIR`. Until it's available, token counts fall back to a
+    character heuristic, which is logged once. Await `load_encoding()` to
+    wait for it instead.
+    """
+    global _fallback_logged
+    _start_loading()
+    if _encoding is None and not _fallback_logged:
+        _fallback_logged = True
+        logfire.warn(
+            "tokenizer {status}, estimating tokens as {chars} characters each",
+            status="unavailable" if _loaded.is_set() else "still loading",
+            chars=CHARS_PER_TOKEN,
+        )
+    return _encoding
+
+
+async def load_encoding(timeout: float | None = TOKENIZER_LOAD_TIMEOUT) -> None:
+    """Wait up to `timeout` seconds for the tokenizer without blocking the loop.
+
+    Returns immediately once it's loaded or has failed to load, and after one
+    wait has already timed out, so a stuck download delays only the first
+    runs in a process.
+    """
+    global _wait_timed_out
+    if _loaded.is_set() or _wait_timed_out:
+        return
+    _start_loading()
+    if not await asyncio.to_thread(_loaded.wait, timeout):
+        _wait_timed_out = True
+        logfire.warn(
+            "tokenizer not loaded after {timeout}s, estimating tokens from "
+            "characters until it is",
+            timeout=timeout,
+        )
+
+
+def count_tokens(text: str) -> int:
+    """Count the tokens in `text`."""
+    encoding = get_encoding()
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_tokens(text: str, max_tokens: int) -> tuple[str, bool]:
+    """Truncate `text` to at most `max_tokens` tokens.
+
+    Returns:
+        The (possibly) truncated text and whether it was truncated.
+    """
+    if max_tokens <= 0:
+        return "", bool(text)
+
+    encoding = get_encoding()
+    if encoding is None:
+        max_chars = max_tokens * CHARS_PER_TOKEN
+        return text[:max_chars], len(text) > max_chars
+
+    # Only tokenize a bounded prefix so huge pages aren't encoded in full
+    prefix = text[: max_tokens * CHARS_PER_TOKEN * 2]
+    tokens = encoding.encode(prefix, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return prefix, len(prefix) < len(text)
+    return encoding.decode(tokens[:max_tokens]), True
+
+
+def allocate_budget(demands: list[int], weights: list[float], budget: int) -> list[int]:
+    """Split `budget` across items in proportion to their weights.
+
+    Items never receive more than they demand; whatever they leave unused is
+    redistributed among the remaining items by weight. Weights must be positive.
+    """
+    allocations = [0] * len(demands)
+    active = {i for i, demand in enumerate(demands) if demand > 0}
+    remaining = budget
+
+    while active and remaining > 0:
+        total_weight = sum(weights[i] for i in active)
+        shares = {i: remaining * weights[i] / total_weight for i in active}
+        satisfied = [i for i in active if demands[i] - allocations[i] <= shares[i]]
+        if not satisfied:
+            for i in active:
+                allocations[i] += math.floor(shares[i])
+            break
+        for i in satisfied:
+            remaining -= demands[i] - allocations[i]
+            allocations[i] = demands[i]
+            active.remove(i)
+
+    return allocations
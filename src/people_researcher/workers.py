@@ -0,0 +1,268 @@
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import multiprocessing
+import queue
+import sys
+import traceback
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import logfire
+
+from .batch import format_result, journal_key, read_people, research_rows
+from .deps import ResearchDeps
+from .journal import BatchJournal
+from .metrics import serve_metrics
+from .ratelimit import SharedPause
+from .research import Researcher
+from .telemetry import TelemetrySettings, configure_telemetry
+
+if TYPE_CHECKING:
+    from multiprocessing.process import BaseProcess
+    from multiprocessing.queues import Queue
+
+# Seconds between checks that every worker is still alive while waiting on results
+POLL_INTERVAL = 1.0
+
+# (kind, worker index, value) sent from workers to the parent: for "result",
+# the JSON line plus the journal key and info to record once it's written,
+# the row count for "done" and a traceback for "error"
+Message = tuple[str, int, Any]
+
+
+@dataclass(frozen=True)
+class _WorkerConfig:
+    index: int
+    workers: int
+    deps_factory: Callable[[], ResearchDeps]
+    input_path: str | Path
+    max_concurrency: int
+    max_connections: int
+    max_keepalive_connections: int
+    journal_path: str | Path | None
+    metrics_port: int | None
+    metrics_host: str
+    telemetry: TelemetrySettings | None
+    search_pause: SharedPause
+    llm_pause: SharedPause
+
+
+def _worker_deps(config: _WorkerConfig) -> ResearchDeps:
+    """Create a worker's deps with its share of every rate limit."""
+    deps = config.deps_factory()
+    return dataclasses.replace(
+        deps,
+        search_limiter=deps.search_limiter.for_worker(
+            config.workers, config.search_pause
+        )
+        if deps.search_limiter is not None
+        else None,
+        llm_limiter=deps.llm_limiter.for_worker(config.workers, config.llm_pause)
+        if deps.llm_limiter is not None
+        else None,
+    )
+
+
+async def _research_shard(config: _WorkerConfig, results: Queue[Message]) -> int:
+    journal = (
+        BatchJournal(config.journal_path) if config.journal_path is not None else None
+    )
+    metrics_server = (
+        asyncio.create_task(
+            serve_metrics(
+                host=config.metrics_host, port=config.metrics_port + config.index
+            )
+        )
+        if config.metrics_port is not None
+        else None
+    )
+    count = 0
+    try:
+        async with Researcher.pooled(
+            _worker_deps(config),
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+        ) as researcher:
+            # Every worker reads the input but only parses its own shard of
+            # the rows, so rows never have to be sent between processes, and
+            # duplicate rows are researched once by the same worker
+            people = read_people(config.input_path, config.index, config.workers)
+            with logfire.span("research_shard", worker=config.index):
+                async for state, result in research_rows(
+                    researcher, people, config.max_concurrency, journal
+                ):
+                    line = format_result(state, result)
+                    if journal is not None and not isinstance(result, Exception):
+                        completed = (journal_key(state), result)
+                    else:
+                        completed = None
+                    results.put(("result", config.index, (line, completed)))
+                    count += 1
+    finally:
+        if metrics_server is not None:
+            metrics_server.cancel()
+        if journal is not None:
+            journal.close()
+    return count
+
+
+def _run_worker(config: _WorkerConfig, results: Queue[Message]) -> None:
+    """Entry point of a worker process."""
+    configure_telemetry(config.telemetry)
+    try:
+        count = asyncio.run(_research_shard(config, results))
+    except Exception:
+        results.put(("error", config.index, traceback.format_exc()))
+        raise
+    results.put(("done", config.index, count))
+
+
+def _next_message(
+    results: Queue[Message], processes: Sequence[BaseProcess], running: set[int]
+) -> Message:
+    """Wait for the next message from a worker.
+
+    Raises:
+        RuntimeError: If a worker exited without reporting that it was done.
+    """
+    while True:
+        try:
+            return results.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+        exited = [i for i in running if processes[i].exitcode is not None]
+        if exited:
+            # A worker flushes its messages before exiting, so anything it
+            # sent is readable by now
+            try:
+                return results.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                i = exited[0]
+                raise RuntimeError(
+                    f"research worker {i} exited with code {processes[i].exitcode}"
+                ) from None
+
+
+async def run_batch_workers(
+    deps_factory: Callable[[], ResearchDeps],
+    input_path: str | Path,
+    output_path: str | Path | None = None,
+    workers: int = 2,
+    max_concurrency: int = 10,
+    journal_path: str | Path | None = None,
+    metrics_port: int | None = None,
+    metrics_host: str = "127.0.0.1",
+    telemetry: TelemetrySettings | None = None,
+    max_connections: int | None = None,
+    max_keepalive_connections: int = 20,
+) -> int:
+    """Research every person in `input_path` across worker processes.
+
+    Like `run_batch()`, but rows are sharded across `workers` processes, each
+    running its own event loop with up to `max_concurrency` rows in flight, so
+    parsing, validation and prompt formatting aren't bound to a single core.
+    Results are streamed back and written to one JSONL output as they complete.
+
+    Rate limits in the deps are split evenly between workers, and a 429 or
+    exhausted quota seen by one worker pauses that provider in all of them.
+
+    Args:
+        deps_factory: Picklable callable creating the deps in each worker, as
+            deps hold clients and connections that can't be sent between
+            processes.
+        input_path: `.csv` or `.jsonl` file of people.
+        output_path: JSONL file to write results to, or stdout if `None`.
+        workers: Number of worker processes.
+        max_concurrency: Maximum number of rows researched at once per worker.
+        journal_path: SQLite `BatchJournal` shared by every worker to record
+            progress in and resume from.
+        metrics_port: Serve each worker's metrics on this port plus its index.
+        metrics_host: Interface to serve metrics on.
+        telemetry: Telemetry settings for the workers.
+        max_connections: Maximum open HTTP connections to each provider per
+            worker, or four per row in flight if `None`.
+        max_keepalive_connections: Maximum idle connections kept open to each
+            provider per worker.
+
+    Returns:
+        The number of rows researched.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+
+    configure_telemetry(telemetry)
+    # Opened before starting workers so its tables are created once rather
+    # than racing in every worker. Rows are only marked as completed here,
+    # once they've been written to the output
+    journal = BatchJournal(journal_path) if journal_path is not None else None
+
+    context = multiprocessing.get_context("spawn")
+    results: Queue[Message] = context.Queue()
+    search_pause, llm_pause = SharedPause(), SharedPause()
+    processes = [
+        context.Process(
+            target=_run_worker,
+            args=(
+                _WorkerConfig(
+                    index=i,
+                    workers=workers,
+                    deps_factory=deps_factory,
+                    input_path=input_path,
+                    max_concurrency=max_concurrency,
+                    max_connections=max_connections or max_concurrency * 4,
+                    max_keepalive_connections=max_keepalive_connections,
+                    journal_path=journal_path,
+                    metrics_port=metrics_port,
+                    metrics_host=metrics_host,
+                    telemetry=telemetry,
+                    search_pause=search_pause,
+                    llm_pause=llm_pause,
+                ),
+                results,
+            ),
+            name=f"research-worker-{i}",
+        )
+        for i in range(workers)
+    ]
+
+    count = 0
+    with logfire.span("run_batch_workers", input_path=str(input_path), workers=workers):
+        mode = "a" if journal_path is not None else "w"
+        output = open(output_path, mode) if output_path is not None else sys.stdout
+        try:
+            for process in processes:
+                process.start()
+
+            running = set(range(workers))
+            while running:
+                kind, index, value = await asyncio.to_thread(
+                    _next_message, results, processes, running
+                )
+                if kind == "result":
+                    line, completed = value
+                    output.write(line)
+                    output.flush()
+                    if journal is not None and completed is not None:
+                        await journal.set_result(*completed)
+                    count += 1
+                elif kind == "done":
+                    running.discard(index)
+                else:
+                    raise RuntimeError(f"research worker {index} failed:\n{value}")
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                if process.pid is not None:
+                    process.join()
+            if output is not sys.stdout:
+                output.close()
+            if journal is not None:
+                journal.close()
+
+        logfire.info("researched {count} people", count=count)
+    return count
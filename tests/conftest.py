@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from people_researcher.deps import ResearchDeps
+from pydantic_ai.models.test import TestModel
+
+
+class StubSearchClient:
+    """Tavily client returning one result about each query."""
+
+    async def search(self, query: str, **kwargs: Any) -> dict[str, Any]:
+        return {
+            "query": query,
+            "results": [
+                {
+                    "url": f"https://example.com/{query}",
+                    "title": query,
+                    "content": f"about {query}",
+                    "score": 1.0,
+                }
+            ],
+        }
+
+
+@pytest.fixture
+def stub_deps() -> ResearchDeps:
+    """Dependencies that research offline, with a stub search client and model."""
+    return ResearchDeps(
+        search_client=StubSearchClient(),  # pyright: ignore[reportArgumentType]
+        model=TestModel(),
+    )
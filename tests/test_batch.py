@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from people_researcher.batch import journal_key, read_people, research_rows, run_batch
+from people_researcher.deps import ResearchDeps
+from people_researcher.journal import BatchJournal
+from people_researcher.research import Researcher
+from people_researcher.state import PersonInfo, PersonState
+
+
+class FlakyResearcher(Researcher):
+    """Researcher that fails for emails starting with "bad"."""
+
+    async def research(
+        self, state: PersonState, run_id: str | None = None
+    ) -> PersonInfo:
+        if state.email and state.email.startswith("bad"):
+            raise RuntimeError(f"no results for {state.email}")
+        return PersonInfo(
+            years_experience=1,
+            current_company="ACME",
+            role="Engineer",
+            prior_companies=[],
+            notes="",
+        )
+
+
+@pytest.mark.asyncio
+async def test_failed_rows_are_written_as_errors(tmp_path: Path):
+    emails = ["a@acme.com", "bad1@acme.com", "b@acme.com", "bad2@acme.com"]
+    input_path = tmp_path / "people.jsonl"
+    input_path.write_text("".join(json.dumps({"email": e}) + "\n" for e in emails))
+    output_path = tmp_path / "results.jsonl"
+
+    count = await run_batch(FlakyResearcher(), input_path, output_path)
+
+    records = {
+        record["email"]: record
+        for record in map(json.loads, output_path.read_text().splitlines())
+    }
+    assert count == 4
+    assert records.keys() == set(emails)
+    assert records["a@acme.com"]["info"]["current_company"] == "ACME"
+    assert records["bad1@acme.com"]["error"] == (
+        "RuntimeError: no results for bad1@acme.com"
+    )
+    assert "info" not in records["bad2@acme.com"]
+
+
+def write_people(path: Path, emails: list[str]) -> None:
+    path.write_text("".join(json.dumps({"email": e}) + "\n" for e in emails))
+
+
+@pytest.mark.asyncio
+async def test_journaled_duplicate_rows_are_researched_once(
+    tmp_path: Path, stub_deps: ResearchDeps
+):
+    input_path = tmp_path / "people.jsonl"
+    write_people(input_path, ["a@acme.com", "a@acme.com", "b@acme.com"])
+    output_path = tmp_path / "results.jsonl"
+    journal = BatchJournal(tmp_path / "journal.db")
+
+    count = await run_batch(
+        Researcher(stub_deps), input_path, output_path, journal=journal
+    )
+
+    emails = [json.loads(line)["email"] for line in output_path.open()]
+    assert count == 2
+    assert sorted(emails) == ["a@acme.com", "b@acme.com"]
+
+
+@pytest.mark.asyncio
+async def test_rows_are_only_completed_once_written(
+    tmp_path: Path, stub_deps: ResearchDeps
+):
+    input_path = tmp_path / "people.jsonl"
+    write_people(input_path, ["a@acme.com"])
+    output_path = tmp_path / "results.jsonl"
+    journal = BatchJournal(tmp_path / "journal.db")
+    key = journal_key(next(read_people(input_path)))
+
+    # Research the row but crash before its result is written out
+    async for _ in research_rows(
+        Researcher(stub_deps), read_people(input_path), 1, journal
+    ):
+        pass
+    assert journal.get_result(key) is None
+    assert await journal.load(key) is not None
+
+    count = await run_batch(
+        Researcher(stub_deps), input_path, output_path, journal=journal
+    )
+
+    assert count == 1
+    assert len(output_path.read_text().splitlines()) == 1
+    assert journal.get_result(key) is not None
+    assert await journal.load(key) is None
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".jsonl"])
+def test_shards_split_rows_and_keep_duplicates_together(tmp_path: Path, suffix: str):
+    emails = [f"person{i}@acme.com" for i in range(20)] + ["person3@acme.com"]
+    input_path = tmp_path / f"people{suffix}"
+    if suffix == ".csv":
+        input_path.write_text("email,name\n" + "".join(f"{e},\n" for e in emails))
+    else:
+        write_people(input_path, emails)
+
+    shards = [
+        [str(state.email) for state in read_people(input_path, shard, 3)]
+        for shard in range(3)
+    ]
+
+    assert sorted(email for shard in shards for email in shard) == sorted(emails)
+    assert sum("person3@acme.com" in shard for shard in shards) == 1
+    assert [state.email for state in read_people(input_path)] == emails
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from people_researcher.cache import SqliteCache
+
+
+def stored_keys(path: Path) -> set[str]:
+    with sqlite3.connect(path) as conn:
+        return {key for (key,) in conn.execute("SELECT key FROM cache")}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_evicts_least_recently_used(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    cache = SqliteCache(path, max_entries=3, access_batch_size=1000)
+    for key in ("a", "b", "c"):
+        await cache.set(key, key.encode())
+    # The read is only buffered, but is written before the next insert evicts
+    assert await cache.get("a") == b"a"
+    await cache.set("d", b"d")
+    await cache.set("b", b"b2")
+    cache.close()
+
+    assert stored_keys(path) == {"a", "b", "d"}
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_batches_access_times(tmp_path: Path):
+    path = tmp_path / "cache.db"
+    cache = SqliteCache(path, access_batch_size=2)
+    await cache.set("a", b"a")
+    await cache.set("b", b"b")
+
+    def accessed() -> dict[str, float]:
+        with sqlite3.connect(path) as conn:
+            return dict(conn.execute("SELECT key, accessed FROM cache"))
+
+    written = accessed()
+    assert await cache.get("a") == b"a"
+    assert accessed() == written
+    assert await cache.get("b") == b"b"
+    after = accessed()
+    assert after["a"] > written["a"]
+    assert after["b"] > written["b"]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_expires_entries(tmp_path: Path):
+    cache = SqliteCache(tmp_path / "cache.db", ttl=0.0)
+    await cache.set("a", b"a")
+    assert await cache.get("a") is None
+    assert await cache.get("missing") is None
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_sqlite_cache_bound_holds_across_processes(tmp_path: Path):
+    # Two handles on one file stand in for two worker processes
+    path = tmp_path / "cache.db"
+    first = SqliteCache(path, max_entries=10)
+    second = SqliteCache(path, max_entries=10)
+    for i in range(8):
+        await first.set(f"first{i}", b"x")
+    for i in range(8):
+        await second.set(f"second{i}", b"x")
+    await first.set("first8", b"x")
+    await first.set("first9", b"x")
+    await first.set("first10", b"x")
+    first.close()
+    second.close()
+
+    # first's count crossed the bound, so it recounted the shared rows and
+    # evicted the oldest down to 10% below the bound
+    assert stored_keys(path) == {
+        *(f"second{i}" for i in range(2, 8)),
+        "first8",
+        "first9",
+        "first10",
+    }
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from people_researcher.metrics import Counter, Gauge, Histogram, serve_metrics
+
+
+def test_counter_renders_each_labelled_series():
+    counter = Counter("searches_total", "Searches by source", ["source"])
+    counter.inc(source="tavily")
+    counter.inc(2, source="tavily")
+    counter.inc(source="cache")
+
+    assert counter.render().splitlines() == [
+        "# HELP searches_total Searches by source",
+        "# TYPE searches_total counter",
+        'searches_total{source="tavily"} 3.0',
+        'searches_total{source="cache"} 1.0',
+    ]
+
+
+def test_counter_rejects_wrong_labels():
+    counter = Counter("searches_total", "Searches by source", ["source"])
+    with pytest.raises(ValueError):
+        counter.inc(provider="tavily")
+
+
+def test_gauge_goes_up_and_down():
+    gauge = Gauge("in_flight", "Runs in progress")
+    gauge.inc()
+    gauge.inc()
+    gauge.dec()
+    assert gauge.samples() == ["in_flight 1.0"]
+
+    gauge.set(7)
+    assert gauge.render().splitlines()[1:] == [
+        "# TYPE in_flight gauge",
+        "in_flight 7.0",
+    ]
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram("latency", "Latency", ["node"], buckets=[1, 0.1])
+    for value in (0.05, 0.1, 0.5, 5):
+        histogram.observe(value, node="Research")
+
+    assert histogram.samples() == [
+        'latency_bucket{node="Research",le="0.1"} 2',
+        'latency_bucket{node="Research",le="1.0"} 3',
+        'latency_bucket{node="Research",le="+Inf"} 4',
+        'latency_sum{node="Research"} 5.65',
+        'latency_count{node="Research"} 4',
+    ]
+
+
+def test_label_values_are_escaped():
+    counter = Counter("errors_total", "Errors", ["error"])
+    counter.inc(error='bad "quote" \\ and\nnewline')
+
+    assert counter.samples() == [
+        'errors_total{error="bad \\"quote\\" \\\\ and\\nnewline"} 1.0'
+    ]
+
+
+@pytest.mark.asyncio
+async def test_serve_metrics_answers_scrapes(unused_tcp_port: int):
+    server = asyncio.create_task(serve_metrics(port=unused_tcp_port))
+    try:
+        for _ in range(50):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", unused_tcp_port
+                )
+                break
+            except ConnectionRefusedError:
+                await asyncio.sleep(0.01)
+        else:
+            pytest.fail("metrics server didn't start")
+        writer.write(b"GET /metrics HTTP/1.1\r\nHost: localhost\r\n\r\n")
+        response = await reader.read()
+        writer.close()
+    finally:
+        server.cancel()
+
+    head, _, body = response.partition(b"\r\n\r\n")
+    assert head.startswith(b"HTTP/1.1 200 OK")
+    assert b"# TYPE research_runs_total counter" in body
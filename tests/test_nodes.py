@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+from typing import Any
+
+import httpx
+import pytest
+from pydantic_graph import GraphRunContext
+
+from people_researcher import retry
+from people_researcher.completeness import CompletenessPolicy
+from people_researcher.deps import ResearchDeps
+from people_researcher.nodes import GenerateQueries, Reflect, Research, search
+from people_researcher.report import RunReport
+from people_researcher.state import PersonInfo, PersonState
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ToolCallPart,
+    UserPromptPart,
+)
+from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+
+class FailingSearchClient:
+    async def search(self, query: str, **kwargs: Any) -> dict[str, Any]:
+        raise ValueError(f"search failed: {query}")
+
+
+def context(state: PersonState) -> GraphRunContext[PersonState, ResearchDeps]:
+    deps = ResearchDeps(
+        search_client=FailingSearchClient(),  # pyright: ignore[reportArgumentType]
+        search_retries=0,
+    )
+    return GraphRunContext(state, deps)
+
+
+@pytest.mark.asyncio
+async def test_failed_searches_without_info_fail_the_run():
+    state = PersonState(email="jane@acme.com", search_queries=["jane doe"])
+
+    with pytest.raises(ExceptionGroup):
+        await Research().run(context(state))
+    assert [f.query for f in state.failed_searches] == ["jane doe"]
+
+
+@pytest.mark.asyncio
+async def test_failed_searches_on_reflection_cycle_keep_info():
+    info = PersonInfo(
+        years_experience=5,
+        current_company="ACME",
+        role="Engineer",
+        prior_companies=[],
+        notes="",
+    )
+    state = PersonState(
+        email="jane@acme.com",
+        search_queries=["jane doe role"],
+        reflection_count=1,
+        info=info,
+    )
+
+    node = await Research().run(context(state))
+
+    assert isinstance(node, Reflect)
+    assert state.info is info
+    assert len(state.failed_searches) == 1
+
+
+@pytest.mark.asyncio
+async def test_incomplete_info_targets_missing_fields_in_next_queries():
+    info = PersonInfo(
+        years_experience=5,
+        current_company="ACME",
+        role="Unknown",
+        prior_companies=[],
+        notes="",
+    )
+    state = PersonState(email="jane@acme.com", info=info)
+    prompts: list[str] = []
+
+    async def respond(messages: list[ModelMessage], agent: AgentInfo) -> ModelResponse:
+        prompts.extend(
+            part.content
+            for message in messages
+            if isinstance(message, ModelRequest)
+            for part in message.parts
+            if isinstance(part, UserPromptPart)
+        )
+        tool = agent.result_tools[0]
+        return ModelResponse(
+            parts=[ToolCallPart.from_raw_args(tool.name, '{"queries": ["jane role"]}')]
+        )
+
+    deps = ResearchDeps(
+        model=FunctionModel(respond),
+        completeness=CompletenessPolicy(incomplete_threshold=0.9),
+    )
+    ctx = GraphRunContext(state, deps)
+
+    node = await Reflect().run(ctx)
+    assert isinstance(node, GenerateQueries)
+    assert state.missing_fields == ["role", "prior_companies", "notes"]
+
+    await node.run(ctx)
+    assert "role, prior_companies, notes" in prompts[-1]
+    assert state.search_queries == ["jane role"]
+
+
+class FlakySearchClient:
+    """Search client whose first request fails with a connection error."""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def search(self, query: str, **kwargs: Any) -> dict[str, Any]:
+        self.requests += 1
+        if self.requests == 1:
+            raise httpx.ConnectError("connection reset")
+        return {
+            "results": [{"url": "https://example.com", "title": query, "content": "hi"}]
+        }
+
+
+@pytest.mark.asyncio
+async def test_report_counts_every_search_request(monkeypatch: pytest.MonkeyPatch):
+    def no_backoff(attempt: int) -> float:
+        return 0.0
+
+    monkeypatch.setattr(retry, "backoff_delay", no_backoff)
+    client = FlakySearchClient()
+    deps = ResearchDeps(
+        search_client=client,  # pyright: ignore[reportArgumentType]
+        search_retries=1,
+    )
+    report = RunReport()
+
+    await search("jane doe", deps, report)
+
+    assert client.requests == 2
+    assert report.search_calls == 2
+    assert report.search_cache_hits == 0
+    assert report.source_bytes == 2
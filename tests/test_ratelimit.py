@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import types
+
+import pytest
+
+from people_researcher import ratelimit
+from people_researcher.ratelimit import (
+    MIN_BACKOFF,
+    RateLimiter,
+    SharedPause,
+    TokenBucket,
+    parse_duration,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    clock = FakeClock()
+    # Only the limiter's view of time is faked, not the event loop's
+    monkeypatch.setattr(
+        ratelimit,
+        "time",
+        types.SimpleNamespace(monotonic=clock.monotonic, time=clock.time),
+    )
+    return clock
+
+
+@pytest.mark.parametrize(
+    ("value", "seconds"),
+    [
+        ("2", 2.0),
+        (" 1.5 ", 1.5),
+        ("-3", 0.0),
+        ("1.5s", 1.5),
+        ("20ms", 0.02),
+        ("6m0s", 360.0),
+        ("1h2m3s", 3723.0),
+        ("soon", None),
+        ("", None),
+    ],
+)
+def test_parse_duration(value: str, seconds: float | None):
+    assert parse_duration(value) == pytest.approx(seconds)
+
+
+def test_token_bucket_refills_up_to_capacity(clock: FakeClock):
+    bucket = TokenBucket(rate=2.0, capacity=4.0)
+    assert bucket.wait_time(4) == 0.0
+
+    bucket.take(4)
+    assert bucket.wait_time(1) == pytest.approx(0.5)
+    clock.now += 0.5
+    assert bucket.wait_time(1) == 0.0
+
+    clock.now += 100
+    assert bucket.wait_time(4) == 0.0
+    assert bucket.wait_time(5) == 0.0
+
+
+def test_token_bucket_oversized_requests_go_into_debt(clock: FakeClock):
+    bucket = TokenBucket(rate=1.0, capacity=2.0)
+    bucket.take(5)
+    # The bucket is 3 tokens in debt, so the next token is 4 seconds away
+    assert bucket.wait_time(1) == pytest.approx(4.0)
+
+
+def test_rate_limiter_backs_off_on_429_and_recovers(clock: FakeClock):
+    pause = SharedPause()
+    limiter = RateLimiter("test", 10, shared_pause=pause)
+
+    limiter.observe(429, {})
+    assert limiter.current_rate == pytest.approx(5.0)
+    assert pause.remaining() == pytest.approx(MIN_BACKOFF)
+
+    # Without Retry-After the pause doubles on every 429, and the rate has a floor
+    for _ in range(3):
+        limiter.observe(429, {})
+    assert limiter.current_rate == pytest.approx(1.0)
+    assert pause.remaining() == pytest.approx(8 * MIN_BACKOFF)
+
+    for _ in range(5):
+        limiter.observe(200, {})
+    assert limiter.current_rate == pytest.approx(3.5)
+    for _ in range(100):
+        limiter.observe(200, {})
+    assert limiter.current_rate == pytest.approx(10.0)
+
+
+def test_rate_limiter_honors_retry_after_and_reset_headers(clock: FakeClock):
+    pause = SharedPause()
+    limiter = RateLimiter("test", 10, shared_pause=pause)
+
+    limiter.observe(429, {"retry-after": "7"})
+    assert pause.remaining() == pytest.approx(7)
+
+    limiter.observe(
+        200, {"x-ratelimit-remaining-tokens": "0", "x-ratelimit-reset-tokens": "1m"}
+    )
+    assert pause.remaining() == pytest.approx(60)
+
+    # Requests left means no pause, whatever the reset
+    limiter.observe(
+        200, {"x-ratelimit-remaining-requests": "5", "x-ratelimit-reset-requests": "1h"}
+    )
+    assert pause.remaining() == pytest.approx(60)
+
+
+def test_rate_limiter_splits_budget_between_workers():
+    limiter = RateLimiter("test", 10, tokens_per_minute=6000, burst=8)
+    worker = limiter.for_worker(4)
+    assert worker.requests_per_second == 2.5
+    assert worker.tokens_per_minute == 1500
+    assert worker.burst == 2.0
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from people_researcher.clients import PooledTavilyClient
+from people_researcher.deps import ResearchDeps
+from people_researcher.report import RunReport
+from people_researcher.research import Researcher, research_person
+from people_researcher.state import PersonInfo, PersonState
+
+
+@pytest.mark.asyncio
+async def test_research_person_fills_in_report(stub_deps: ResearchDeps):
+    report = RunReport()
+
+    await research_person("jane@acme.com", deps=stub_deps, report=report)
+
+    assert report.total_seconds > 0
+    assert report.node_visits["GenerateQueries"] >= 1
+    assert report.agents["query_generator"].runs >= 1
+    assert report.search_calls > 0
+
+
+class FailFastResearcher(Researcher):
+    """Researcher that fails at once for "bad" emails and succeeds slowly otherwise."""
+
+    async def research(
+        self, state: PersonState, run_id: str | None = None
+    ) -> PersonInfo:
+        if state.email and state.email.startswith("bad"):
+            raise ValueError(f"invalid extraction for {state.email}")
+        await asyncio.sleep(0.05)
+        return PersonInfo(
+            years_experience=1,
+            current_company="ACME",
+            role="Engineer",
+            prior_companies=[],
+            notes="",
+        )
+
+
+@pytest.mark.asyncio
+async def test_research_many_yields_failures_without_cancelling_other_runs():
+    people = [
+        PersonState(email=email)
+        for email in ["a@acme.com", "bad@acme.com", "b@acme.com", "c@acme.com"]
+    ]
+
+    results = {
+        state.email: result
+        async for state, result in FailFastResearcher().research_many(
+            people, max_concurrency=3
+        )
+    }
+
+    assert isinstance(results.pop("bad@acme.com"), ValueError)
+    assert all(isinstance(info, PersonInfo) for info in results.values())
+    assert len(results) == 3
+
+
+@pytest.mark.asyncio
+async def test_pooled_keeps_caller_supplied_clients(
+    stub_deps: ResearchDeps, monkeypatch: pytest.MonkeyPatch
+):
+    # The pooled clients are still created, and need keys to construct
+    monkeypatch.setenv("TAVILY_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+    async with Researcher.pooled(stub_deps) as researcher:
+        assert researcher.deps.search_client is stub_deps.search_client
+        assert researcher.deps.model is stub_deps.model
+
+    async with Researcher.pooled(ResearchDeps(model=stub_deps.model)) as researcher:
+        assert isinstance(researcher.deps.search_client, PooledTavilyClient)
+        assert researcher.deps.model is stub_deps.model
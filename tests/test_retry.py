@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from people_researcher import retry
+from people_researcher.ratelimit import RateLimiter
+from people_researcher.retry import (
+    MIN_LATENCY_SAMPLES,
+    LatencyTracker,
+    call_with_retry,
+    hedged,
+)
+
+
+def never_retryable(error: BaseException) -> bool:
+    return False
+
+
+def no_backoff(attempt: int) -> float:
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_limiter_wait_does_not_count_against_timeout():
+    # 12 calls at 20/s queue for up to ~0.55s, well past the 0.1s timeout
+    limiter = RateLimiter("test", 20, burst=1)
+    sent = 0
+
+    async def call() -> str:
+        nonlocal sent
+        sent += 1
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    results = await asyncio.gather(
+        *(
+            call_with_retry(
+                call,
+                name="test",
+                retryable=never_retryable,
+                retries=0,
+                timeout=0.1,
+                limiter=limiter,
+            )
+            for _ in range(12)
+        )
+    )
+
+    assert results == ["ok"] * 12
+    assert sent == 12
+
+
+@pytest.mark.asyncio
+async def test_retries_retryable_errors_and_timeouts(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(retry, "backoff_delay", no_backoff)
+    attempts = 0
+
+    async def call() -> str:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionError("reset")
+        if attempts == 2:
+            await asyncio.sleep(1)
+        return "ok"
+
+    result = await call_with_retry(
+        call,
+        name="test",
+        retryable=lambda e: isinstance(e, ConnectionError),
+        timeout=0.05,
+    )
+    assert result == "ok"
+    assert attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_does_not_retry_other_errors_or_past_the_limit(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(retry, "backoff_delay", no_backoff)
+    attempts = 0
+
+    async def call() -> str:
+        nonlocal attempts
+        attempts += 1
+        raise ValueError("bad request")
+
+    with pytest.raises(ValueError):
+        await call_with_retry(call, name="test", retryable=never_retryable)
+    assert attempts == 1
+
+    attempts = 0
+    with pytest.raises(ValueError):
+        await call_with_retry(call, name="test", retryable=lambda e: True, retries=2)
+    assert attempts == 3
+
+
+@pytest.mark.asyncio
+async def test_hedge_returns_the_first_result_and_cancels_the_other():
+    calls = 0
+    cancelled = False
+
+    async def call() -> int:
+        nonlocal calls, cancelled
+        calls += 1
+        index = calls
+        try:
+            # The first request straggles, its hedge returns quickly
+            await asyncio.sleep(1 if index == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        return index
+
+    assert await hedged(call, hedge_after=0.02) == 2
+    assert calls == 2
+    # Cancellation is delivered to the straggler on the next loop iteration
+    await asyncio.sleep(0)
+    assert cancelled
+
+
+@pytest.mark.asyncio
+async def test_hedge_only_fails_once_every_request_has():
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.05)
+            raise ConnectionError("reset")
+        await asyncio.sleep(0.1)
+        return calls
+
+    assert await hedged(call, hedge_after=0.01) == 2
+
+    async def failing() -> int:
+        await asyncio.sleep(0.01)
+        raise ConnectionError("reset")
+
+    with pytest.raises(ConnectionError):
+        await hedged(failing, hedge_after=0.001)
+
+
+@pytest.mark.asyncio
+async def test_no_hedge_without_enough_latency_samples():
+    latency = LatencyTracker()
+    calls = 0
+
+    async def call() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    for _ in range(MIN_LATENCY_SAMPLES - 1):
+        latency.record(0.001)
+    assert latency.percentile(0.9) is None
+    await call_with_retry(
+        call,
+        name="test",
+        retryable=never_retryable,
+        latency=latency,
+        hedge_percentile=0.9,
+    )
+    assert calls == 1
+
+    # Now past the threshold, the 0.001s percentile triggers a hedge
+    await call_with_retry(
+        call,
+        name="test",
+        retryable=never_retryable,
+        latency=latency,
+        hedge_percentile=0.9,
+    )
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_hedge_limiter_wait_does_not_count_against_timeout():
+    # The hedge waits ~0.4s for a slot, past the 0.3s timeout, then answers at once
+    limiter = RateLimiter("test", 2.5, burst=1)
+    latency = LatencyTracker()
+    for _ in range(MIN_LATENCY_SAMPLES):
+        latency.record(0.01)
+    calls = 0
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        index = calls
+        if index == 1:
+            await asyncio.sleep(1)
+        return index
+
+    result = await call_with_retry(
+        call,
+        name="test",
+        retryable=never_retryable,
+        retries=0,
+        timeout=0.3,
+        latency=latency,
+        hedge_percentile=0.5,
+        limiter=limiter,
+    )
+    assert result == 2
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+
+from people_researcher.server import MAX_BODY_SIZE, ResearchServer
+from people_researcher.state import PersonInfo, PersonState
+
+
+class StubResearcher:
+    """Answers every request with the email it was given, once released."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.release.set()
+        self.started = 0
+
+    async def research(self, state: PersonState) -> PersonInfo:
+        self.started += 1
+        await self.release.wait()
+        if state.email == "fail@example.com":
+            raise RuntimeError("research failed")
+        return PersonInfo(
+            years_experience=3,
+            current_company="Example",
+            role="Engineer",
+            prior_companies=[],
+            notes=str(state.email),
+        )
+
+
+class Response:
+    def __init__(self, status: int, headers: dict[str, str], body: bytes):
+        self.status = status
+        self.headers = headers
+        self.body = body
+
+    def json(self) -> Any:
+        return json.loads(self.body)
+
+
+Connect = Callable[[], Awaitable[tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+
+
+async def read_response(reader: asyncio.StreamReader) -> Response:
+    status_line = await reader.readline()
+    _, status, _ = status_line.decode("latin-1").split(" ", 2)
+    headers: dict[str, str] = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers["content-length"]))
+    return Response(int(status), headers, body)
+
+
+def post(path: str, body: bytes, *headers: str) -> bytes:
+    lines = [
+        f"POST {path} HTTP/1.1",
+        "Host: localhost",
+        f"Content-Length: {len(body)}",
+        *headers,
+    ]
+    return ("\r\n".join(lines) + "\r\n\r\n").encode() + body
+
+
+@pytest.fixture
+def researcher() -> StubResearcher:
+    return StubResearcher()
+
+
+@pytest_asyncio.fixture
+async def connect(
+    researcher: StubResearcher, unused_tcp_port: int
+) -> AsyncIterator[Connect]:
+    server = ResearchServer(
+        researcher,  # pyright: ignore[reportArgumentType]
+        max_concurrency=1,
+        max_queue=1,
+    )
+    task = asyncio.create_task(server.serve(port=unused_tcp_port))
+    writers: list[asyncio.StreamWriter] = []
+
+    async def open_connection() -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        for _ in range(50):
+            try:
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", unused_tcp_port
+                )
+            except ConnectionRefusedError:
+                await asyncio.sleep(0.01)
+            else:
+                writers.append(writer)
+                return reader, writer
+        pytest.fail("research server didn't start")
+
+    yield open_connection
+    for writer in writers:
+        writer.close()
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+
+async def request(connect: Connect, raw: bytes) -> Response:
+    reader, writer = await connect()
+    writer.write(raw)
+    return await read_response(reader)
+
+
+async def get_health(connect: Connect) -> dict[str, Any]:
+    return (await request(connect, b"GET /health HTTP/1.1\r\n\r\n")).json()
+
+
+@pytest.mark.asyncio
+async def test_research_returns_person_info(connect: Connect):
+    body = json.dumps({"email": "ada@example.com", "name": "Ada"}).encode()
+    # Header names are case-insensitive and values are trimmed
+    response = await request(
+        connect, post("/research", body, "content-TYPE:   application/json  ")
+    )
+
+    assert response.status == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json()["notes"] == "ada@example.com"
+
+
+@pytest.mark.asyncio
+async def test_connection_is_kept_alive_between_requests(connect: Connect):
+    reader, writer = await connect()
+    for email in ("a@example.com", "b@example.com"):
+        writer.write(post("/research", json.dumps({"email": email}).encode()))
+        response = await read_response(reader)
+        assert response.status == 200
+        assert response.headers["connection"] == "keep-alive"
+        assert response.json()["notes"] == email
+
+    writer.write(b"GET /health HTTP/1.1\r\nConnection: close\r\n\r\n")
+    response = await read_response(reader)
+    assert response.headers["connection"] == "close"
+    assert await reader.read() == b""
+
+
+@pytest.mark.asyncio
+async def test_invalid_body_is_rejected(connect: Connect):
+    response = await request(connect, post("/research", b'{"email": 5}'))
+    assert response.status == 422
+    assert response.json()["detail"][0]["loc"] == ["email"]
+
+    response = await request(connect, post("/research", b"not json"))
+    assert response.status == 422
+
+
+@pytest.mark.asyncio
+async def test_oversized_body_is_rejected_without_reading_it(connect: Connect):
+    reader, writer = await connect()
+    writer.write(
+        b"POST /research HTTP/1.1\r\n"
+        + f"Content-Length: {MAX_BODY_SIZE + 1}\r\n\r\n".encode()
+    )
+    response = await read_response(reader)
+
+    assert response.status == 413
+    assert response.headers["connection"] == "close"
+    assert await reader.read() == b""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("raw", "status"),
+    [
+        (b"GARBAGE\r\n\r\n", 400),
+        (b"POST /research HTTP/1.1\r\nContent-Length: many\r\n\r\n", 400),
+        (b"GET /nowhere HTTP/1.1\r\n\r\n", 404),
+        (b"GET /research HTTP/1.1\r\n\r\n", 405),
+        (b"POST /health HTTP/1.1\r\n\r\n", 405),
+    ],
+)
+async def test_malformed_requests_close_the_connection(
+    connect: Connect, raw: bytes, status: int
+):
+    reader, writer = await connect()
+    writer.write(raw)
+    response = await read_response(reader)
+
+    assert response.status == status
+    assert "error" in response.json()
+    assert await reader.read() == b""
+
+
+@pytest.mark.asyncio
+async def test_failed_research_returns_500(connect: Connect):
+    body = json.dumps({"email": "fail@example.com"}).encode()
+    response = await request(connect, post("/research", body))
+    assert response.status == 500
+    assert response.json() == {"error": "research failed"}
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503_with_retry_after(
+    connect: Connect, researcher: StubResearcher
+):
+    researcher.release.clear()
+    body = json.dumps({"email": "a@example.com"}).encode()
+
+    # The only worker picks up the first request, the second fills the queue
+    running = asyncio.create_task(request(connect, post("/research", body)))
+    while researcher.started == 0:
+        await asyncio.sleep(0.01)
+    queued = asyncio.create_task(request(connect, post("/research", body)))
+    while (health := await get_health(connect))["queued"] == 0:
+        await asyncio.sleep(0.01)
+    assert health == {"status": "ok", "queued": 1, "in_flight": 1}
+
+    rejected = await request(connect, post("/research", body))
+    assert rejected.status == 503
+    assert rejected.headers["retry-after"] == "1"
+
+    researcher.release.set()
+    assert (await running).status == 200
+    assert (await queued).status == 200
+
+
+@pytest.mark.asyncio
+async def test_metrics_are_served_as_prometheus_text(connect: Connect):
+    response = await request(connect, b"GET /metrics HTTP/1.1\r\n\r\n")
+
+    assert response.status == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert b"# TYPE server_queue_depth gauge" in response.body
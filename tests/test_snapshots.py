@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from people_researcher.snapshots import SqliteSnapshotStore
+from people_researcher.state import PersonState
+
+
+@pytest.mark.asyncio
+async def test_sqlite_snapshot_store_round_trips_state(tmp_path: Path):
+    store = SqliteSnapshotStore(tmp_path / "snapshots.db")
+    state = PersonState(email="jane@acme.com", search_queries=["jane acme"])
+
+    await store.save("jane", state, "Research")
+    state.search_queries.append("changed after saving")
+    await store.save("other", PersonState(email="joe@acme.com"), "Extract")
+
+    snapshot = await store.load("jane")
+    assert snapshot is not None
+    restored, next_node = snapshot
+    assert restored.search_queries == ["jane acme"]
+    assert next_node == "Research"
+
+    await store.delete("jane")
+    assert await store.load("jane") is None
+    assert await store.load("other") is not None
+    store.close()
+
+    # Snapshots survive reopening the file
+    reopened = SqliteSnapshotStore(tmp_path / "snapshots.db")
+    assert await reopened.load("other") is not None
+    reopened.close()
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from people_researcher.state import Employment, PersonInfo, merge_person_info
+
+
+def person(**fields: object) -> PersonInfo:
+    return PersonInfo.model_validate(
+        {
+            "years_experience": 5,
+            "current_company": "ACME",
+            "role": "Engineer",
+            "prior_companies": [],
+            "notes": "Known for rockets",
+        }
+        | fields
+    )
+
+
+def test_merge_keeps_known_facts_over_blank_or_unknown_updates():
+    merged = merge_person_info(
+        person(),
+        person(years_experience=3, current_company=" ", role="Unknown", notes=""),
+    )
+    assert merged.years_experience == 5
+    assert merged.current_company == "ACME"
+    assert merged.role == "Engineer"
+    assert merged.notes == "Known for rockets"
+
+
+def test_merge_takes_new_facts():
+    merged = merge_person_info(
+        person(), person(years_experience=7, role="Staff Engineer", notes="Moved")
+    )
+    assert merged.years_experience == 7
+    assert merged.role == "Staff Engineer"
+    assert merged.notes == "Moved"
+
+
+def test_merge_combines_prior_companies():
+    previous = person(
+        prior_companies=[
+            Employment(
+                name="Initech", role="Intern", year_started=2010, year_ended=2011
+            ),
+            Employment(name="Globex", role="Engineer", year_started=2012),
+        ]
+    )
+    update = person(
+        prior_companies=[
+            Employment(name="initech", role="intern", year_started=2010),
+            Employment(
+                name="Globex", role="Engineer", year_started=2012, year_ended=2015
+            ),
+            Employment(name="Hooli", role="Lead", year_started=2016),
+        ]
+    )
+
+    merged = merge_person_info(previous, update)
+
+    assert [(job.name, job.year_ended) for job in merged.prior_companies] == [
+        ("initech", 2011),
+        ("Globex", 2015),
+        ("Hooli", None),
+    ]
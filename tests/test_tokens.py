@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import sys
+import threading
+import time
+
+import pytest
+
+from people_researcher import tokens
+from people_researcher.tokens import allocate_budget
+
+
+def test_allocate_budget_splits_by_weight():
+    assert allocate_budget([100, 100], [3.0, 1.0], 80) == [60, 20]
+
+
+def test_allocate_budget_redistributes_unused_demand():
+    # The first item only needs 10, so the rest goes to the others by weight
+    assert allocate_budget([10, 100, 100], [2.0, 1.0, 1.0], 110) == [10, 50, 50]
+    assert allocate_budget([10, 20], [1.0, 1.0], 1000) == [10, 20]
+
+
+def test_allocate_budget_never_exceeds_the_budget():
+    allocations = allocate_budget([7, 9, 11], [1.0, 2.0, 3.0], 10)
+    assert sum(allocations) <= 10
+    assert all(a <= d for a, d in zip(allocations, [7, 9, 11]))
+
+
+def test_allocate_budget_skips_items_without_demand():
+    assert allocate_budget([0, 50], [5.0, 1.0], 40) == [0, 40]
+    assert allocate_budget([], [], 40) == []
+    assert allocate_budget([10, 10], [1.0, 1.0], 0) == [0, 0]
+
+
+class SlowTiktoken:
+    """Stand-in for tiktoken whose download doesn't finish until released."""
+
+    def __init__(self):
+        self.released = threading.Event()
+
+    def get_encoding(self, name: str) -> WordEncoding:
+        self.released.wait()
+        return WordEncoding()
+
+
+class WordEncoding:
+    def encode(self, text: str, **kwargs: object) -> list[str]:
+        return text.split()
+
+
+@pytest.mark.asyncio
+async def test_slow_tokenizer_download_falls_back_without_blocking(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    tiktoken = SlowTiktoken()
+    monkeypatch.setitem(sys.modules, "tiktoken", tiktoken)
+    for name, value in {
+        "_encoding": None,
+        "_loaded": threading.Event(),
+        "_loader": None,
+        "_fallback_logged": False,
+        "_wait_timed_out": False,
+    }.items():
+        monkeypatch.setattr(tokens, name, value)
+
+    await tokens.load_encoding(timeout=0.01)
+    assert tokens.count_tokens("one two three") == 4
+
+    # Later runs don't wait on the stuck download again
+    start = time.monotonic()
+    await tokens.load_encoding(timeout=5)
+    assert time.monotonic() - start < 1
+
+    tiktoken.released.set()
+    assert tokens._loaded.wait(5)  # pyright: ignore[reportPrivateUsage]
+    assert tokens.count_tokens("one two three") == 3